@@ -0,0 +1,322 @@
+"""
+Utilización horaria de consolas por tipo de consola y sede.
+
+utilización = minutos ocupados / (minutos disponibles - minutos en mantenimiento)
+
+Las consolas son los lotes de productos de la categoría "dispositivos" con
+`console_type`; cada unidad del lote (`initial_stock`) aporta 60 minutos por
+hora. La ocupación sale de los intervalos de `Session` enlazados a esos lotes
+por `SessionLots`, que se leen en bloques y se reparten en horas con
+aritmética de intervalos vectorizada en NumPy. Los días cerrados se guardan
+en caché; el día en curso siempre se calcula. Las señales borran los días
+afectados al confirmar el cambio, y lo calculado dentro de una transacción no
+se guarda.
+"""
+import datetime
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from gamecenter.actions.cache_version import get_version, in_transaction
+from gamecenter.models import ConsoleMaintenance, Lots, Product, SessionLots
+
+VERSION_NAMESPACE = 'utilization'
+
+HOUR = 3600.0
+CHUNK_SIZE = 50000
+
+
+def _day_key(day, version):
+    return f"gamecenter:utilization:{day.isoformat()}:{version}"
+
+
+def invalidate_days(start, end=None):
+    """Borra de la caché los días entre `start` y `end` (fechas, inclusive), al confirmar la transacción."""
+    end = end or start
+
+    def delete():
+        version = get_version(VERSION_NAMESPACE)
+        cache.delete_many([
+            _day_key(start + datetime.timedelta(days=offset), version) for offset in range((end - start).days + 1)
+        ])
+
+    transaction.on_commit(delete)
+
+
+def console_products():
+    return Product.objects.filter(category__group="dispositivos", console_type__isnull=False)
+
+
+# Ids de `console_products()` por versión de utilización: {'version': ..., 'ids': frozenset}.
+_console_product_ids = {'version': None, 'ids': frozenset()}
+
+
+def console_product_ids():
+    """Ids de los productos que son consolas; se vuelven a leer solo cuando cambia la versión."""
+    version = get_version(VERSION_NAMESPACE)
+    if _console_product_ids['version'] == version:
+        return _console_product_ids['ids']
+    ids = frozenset(console_products().values_list('id', flat=True))
+    if not in_transaction():
+        _console_product_ids.update(version=version, ids=ids)
+    return ids
+
+
+def console_units():
+    """{(console_type_id, subsidiary_id): unidades}"""
+    rows = (
+        Lots.objects.filter(product__category__group="dispositivos", product__console_type__isnull=False)
+        .values('product__console_type_id', 'subsidiary_id')
+        .annotate(units=Sum(Coalesce('initial_stock', 1)))
+        .values_list('product__console_type_id', 'subsidiary_id', 'units')
+        .order_by()
+    )
+    return {(console_type_id, subsidiary_id): units for console_type_id, subsidiary_id, units in rows}
+
+
+def _group_keys(console_type_ids, subsidiary_ids, stride):
+    # subsidiary_id puede ser None: se codifica como 0 y los demás como id + 1.
+    return console_type_ids * stride + subsidiary_ids
+
+
+def _session_chunks(start, end, chunk_size):
+    """Bloques de arrays (inicio, fin, console_type_id, subsidiary_id) de sesiones que tocan [start, end)."""
+    now = timezone.now()
+    rows = (
+        SessionLots.objects.filter(
+            lots__product__category__group="dispositivos",
+            lots__product__console_type__isnull=False,
+            session__start_time__lt=end,
+        )
+        .filter(Q(session__end_time__gt=start) | Q(session__end_time__isnull=True))
+        .values_list('session__start_time', 'session__end_time', 'lots__product__console_type_id', 'lots__subsidiary_id')
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield _to_arrays(chunk, now)
+            chunk = []
+    if chunk:
+        yield _to_arrays(chunk, now)
+
+
+def _to_arrays(chunk, now):
+    starts, ends, console_type_ids, subsidiary_ids = zip(*chunk)
+    now = now.timestamp()
+    return (
+        np.fromiter((value.timestamp() for value in starts), dtype=np.float64, count=len(chunk)),
+        np.fromiter((now if value is None else value.timestamp() for value in ends), dtype=np.float64, count=len(chunk)),
+        np.fromiter(console_type_ids, dtype=np.int64, count=len(chunk)),
+        np.fromiter((0 if value is None else value + 1 for value in subsidiary_ids), dtype=np.int64, count=len(chunk)),
+    )
+
+
+def accumulate_occupancy(occupied, full_hours, starts, ends, groups, origin):
+    """
+    Suma los segundos ocupados de cada intervalo [starts, ends) en las horas
+    que atraviesa. `occupied` es (grupos, horas) y recibe las horas parciales
+    de los extremos; `full_hours` es (grupos, horas + 1) y acumula un arreglo
+    de diferencias para las horas completas intermedias.
+    """
+    hours = occupied.shape[1]
+    starts = np.clip(starts - origin, 0, hours * HOUR)
+    ends = np.clip(ends - origin, 0, hours * HOUR)
+    valid = ends > starts
+    starts, ends, groups = starts[valid], ends[valid], groups[valid]
+    if not len(starts):
+        return
+
+    first = np.floor(starts / HOUR).astype(np.int64)
+    last = np.ceil(ends / HOUR).astype(np.int64) - 1
+    same = first == last
+
+    flat_occupied = occupied.reshape(-1)
+    flat_full = full_hours.reshape(-1)
+    width = full_hours.shape[1]
+
+    # Intervalos dentro de una sola hora.
+    np.add.at(flat_occupied, groups[same] * hours + first[same], ends[same] - starts[same])
+
+    # Extremos parciales de los intervalos que cruzan horas.
+    cross = ~same
+    g, f, l = groups[cross], first[cross], last[cross]
+    np.add.at(flat_occupied, g * hours + f, (f + 1) * HOUR - starts[cross])
+    np.add.at(flat_occupied, g * hours + l, ends[cross] - l * HOUR)
+
+    # Horas completas entre ambos extremos: +1 en f + 1, -1 en l.
+    np.add.at(flat_full, g * width + f + 1, 1)
+    np.add.at(flat_full, g * width + l, -1)
+
+
+def compute_utilization(start, end, chunk_size=CHUNK_SIZE):
+    """
+    Utilización por hora en [start, end) (datetimes con zona horaria, en horas
+    exactas). Devuelve (grupos, unidades, ocupados, mantenimiento) donde los dos
+    últimos son arrays (grupos, horas) en minutos.
+    """
+    hours = int((end - start).total_seconds() // HOUR)
+    units_by_group = console_units()
+    groups = sorted(units_by_group, key=lambda group: (group[0], group[1] or 0))
+
+    occupied = np.zeros((len(groups), hours))
+    full_hours = np.zeros((len(groups), hours + 1))
+    downtime = np.zeros((len(groups), hours))
+    units = np.array([units_by_group[group] for group in groups], dtype=np.float64)
+    if not groups or not hours:
+        return groups, units, occupied, downtime
+
+    stride = max((group[1] or 0) for group in groups) + 2
+    keys = np.array([_group_keys(group[0], 0 if group[1] is None else group[1] + 1, stride) for group in groups])
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+
+    origin = start.timestamp()
+    for starts, ends, console_type_ids, subsidiary_ids in _session_chunks(start, end, chunk_size):
+        row_keys = _group_keys(console_type_ids, subsidiary_ids, stride)
+        positions = np.clip(np.searchsorted(sorted_keys, row_keys), 0, len(sorted_keys) - 1)
+        known = (sorted_keys[positions] == row_keys) & (subsidiary_ids < stride)
+        accumulate_occupancy(occupied, full_hours, starts[known], ends[known], order[positions[known]], origin)
+
+    occupied += np.cumsum(full_hours, axis=1)[:, :hours] * HOUR
+    occupied /= 60.0
+
+    _accumulate_downtime(downtime, groups, units, start, end)
+    return groups, units, occupied, downtime
+
+
+def _accumulate_downtime(downtime, groups, units, start, end):
+    """
+    Minutos en mantenimiento por hora: un mantenimiento del tipo de consola
+    deja fuera todas sus unidades durante los días que dura; uno de un lote
+    concreto, solo las unidades de ese lote.
+    """
+    group_index = {group: index for index, group in enumerate(groups)}
+    rows_by_console_type = {}
+    for index, (console_type_id, _) in enumerate(groups):
+        rows_by_console_type.setdefault(console_type_id, []).append(index)
+
+    today = timezone.localdate()
+    maintenances = (
+        ConsoleMaintenance.objects.filter(console_id__in=rows_by_console_type)
+        .filter(Q(end_date__isnull=True) | Q(end_date__gte=timezone.localdate(start)))
+        .annotate(lot_units=Coalesce('lots__initial_stock', 1))
+        .values_list('console_id', 'lots_id', 'lots__subsidiary_id', 'lot_units', 'start_date', 'maintenance_date', 'end_date')
+    )
+    hours = downtime.shape[1]
+    origin = start.timestamp()
+    for console_type_id, lot_id, subsidiary_id, lot_units, start_date, maintenance_date, end_date in maintenances:
+        first_day = start_date or maintenance_date
+        if first_day is None:
+            continue
+        last_day = end_date or today
+        begin = _local_midnight(first_day).timestamp()
+        finish = _local_midnight(last_day + datetime.timedelta(days=1)).timestamp()
+        first_hour = max(int((begin - origin) // HOUR), 0)
+        last_hour = min(int(-(-(finish - origin) // HOUR)), hours)
+        if first_hour >= last_hour:
+            continue
+        if lot_id is None:
+            rows = rows_by_console_type[console_type_id]
+            downtime[rows, first_hour:last_hour] = np.maximum(
+                downtime[rows, first_hour:last_hour], (units[rows] * 60.0)[:, None]
+            )
+        elif (console_type_id, subsidiary_id) in group_index:
+            downtime[group_index[(console_type_id, subsidiary_id)], first_hour:last_hour] += lot_units * 60.0
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _rows_for_day(day, payload, console_type_id=None, subsidiary_id=None):
+    groups, units, occupied, downtime = payload
+    indexes = [
+        index for index, group in enumerate(groups)
+        if (console_type_id is None or group[0] == console_type_id)
+        and (subsidiary_id is None or group[1] == subsidiary_id)
+    ]
+    if not indexes:
+        return []
+
+    available = np.asarray(units, dtype=np.float64)[indexes, None] * 60.0
+    occupied = occupied[indexes]
+    downtime = np.minimum(downtime[indexes], available)
+    capacity = available - downtime
+    with np.errstate(divide='ignore', invalid='ignore'):
+        utilization = np.where(capacity > 0, np.round(occupied / capacity, 4), np.nan)
+
+    day_start = _local_midnight(day)
+    hours = [day_start + datetime.timedelta(hours=hour) for hour in range(occupied.shape[1])]
+    rows = []
+    for position, index in enumerate(indexes):
+        group_console_type_id, group_subsidiary_id = groups[index]
+        group_available = float(available[position, 0])
+        for hour, used, down, ratio in zip(
+            hours,
+            np.round(occupied[position], 2).tolist(),
+            downtime[position].tolist(),
+            utilization[position].tolist(),
+        ):
+            rows.append({
+                'day': day,
+                'hour': hour,
+                'console_type_id': group_console_type_id,
+                'subsidiary_id': group_subsidiary_id,
+                'occupied_minutes': used,
+                'available_minutes': group_available,
+                'downtime_minutes': down,
+                'utilization': None if ratio != ratio else ratio,
+            })
+    return rows
+
+
+def daily_utilization(days, chunk_size=CHUNK_SIZE):
+    """
+    {día: (grupos, unidades, ocupados, mantenimiento)} para cada fecha local de
+    `days`. Los días cerrados salen de la caché; los que faltan se calculan en
+    una sola pasada sobre las sesiones.
+    """
+    today = timezone.localdate()
+    version = get_version(VERSION_NAMESPACE)
+    keys = {day: _day_key(day, version) for day in days}
+    cached = cache.get_many([keys[day] for day in days if day < today])
+    result = {day: cached[keys[day]] for day in days if keys[day] in cached}
+
+    missing = sorted(day for day in days if day not in result)
+    if not missing:
+        return result
+
+    span_start = _local_midnight(missing[0])
+    span_end = _local_midnight(missing[-1] + datetime.timedelta(days=1))
+    groups, units, occupied, downtime = compute_utilization(span_start, span_end, chunk_size)
+    units = units.tolist()
+
+    timeout = getattr(settings, 'GAMECENTER_UTILIZATION_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+    to_cache = {}
+    for day in missing:
+        first = int((_local_midnight(day) - span_start).total_seconds() // HOUR)
+        last = int((_local_midnight(day + datetime.timedelta(days=1)) - span_start).total_seconds() // HOUR)
+        result[day] = (groups, units, occupied[:, first:last].copy(), downtime[:, first:last].copy())
+        if day < today:
+            to_cache[keys[day]] = result[day]
+    if not in_transaction():
+        cache.set_many(to_cache, timeout)
+    return result
+
+
+def hourly_utilization(start_date, end_date, console_type_id=None, subsidiary_id=None, chunk_size=CHUNK_SIZE):
+    """Filas por hora, tipo de consola y sede entre `start_date` y `end_date` (fechas locales, inclusive)."""
+    days = [start_date + datetime.timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    payloads = daily_utilization(days, chunk_size)
+    return [
+        row
+        for day in days
+        for row in _rows_for_day(day, payloads[day], console_type_id, subsidiary_id)
+    ]
@@ -0,0 +1,95 @@
+"""
+Disponibilidad de consolas según sus mantenimientos abiertos.
+
+Los mantenimientos sin `end_date` se cargan en memoria una vez por proceso
+(una consulta sobre el índice parcial `consolemaintenance_open_idx`, más otra
+por los lotes de los tipos de consola afectados) y se vuelven a leer solo
+cuando cambia la versión `console_maintenance`, que las señales de
+`ConsoleMaintenance` y de los lotes de consolas incrementan al confirmar.
+Las comprobaciones no consultan la base de datos. Lo cargado dentro de una
+transacción no se guarda, porque podría incluir mantenimientos que luego se
+reviertan.
+"""
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from gamecenter.actions.cache_version import get_version, in_transaction
+from gamecenter.models import ConsoleMaintenance, Lots
+
+VERSION_NAMESPACE = 'console_maintenance'
+
+# console_types y lots: {id: fecha de inicio}, None si ya empezó sin fecha.
+# lot_console_types: {lot_id: console_type_id} de los lotes cuyo tipo de consola está en mantenimiento.
+_state = {'version': None, 'console_types': {}, 'lots': {}, 'lot_console_types': {}}
+
+
+def load_open_maintenances():
+    console_types, lots = {}, {}
+    rows = ConsoleMaintenance.objects.filter(end_date__isnull=True).values_list('console_id', 'lots_id', 'start_date')
+    for console_type_id, lot_id, start_date in rows:
+        target, key = (lots, lot_id) if lot_id is not None else (console_types, console_type_id)
+        if key not in target or (target[key] is not None and (start_date is None or start_date < target[key])):
+            target[key] = start_date
+
+    lot_console_types = {}
+    if console_types:
+        lot_console_types = dict(
+            Lots.objects.filter(product__category__group="dispositivos", product__console_type_id__in=console_types)
+            .values_list('id', 'product__console_type_id')
+        )
+    return {'console_types': console_types, 'lots': lots, 'lot_console_types': lot_console_types}
+
+
+def _open_maintenances():
+    version = get_version(VERSION_NAMESPACE)
+    if _state['version'] == version:
+        return _state
+    state = load_open_maintenances()
+    if not in_transaction():
+        _state.update(state, version=version)
+    return state
+
+
+def reset():
+    """Olvida la copia local; la próxima comprobación vuelve a cargarla."""
+    _state['version'] = None
+
+
+def _started(start_date, today):
+    return start_date is None or start_date <= today
+
+
+def is_console_type_available(console_type_id, today=None):
+    console_types = _open_maintenances()['console_types']
+    if console_type_id not in console_types:
+        return True
+    return not _started(console_types[console_type_id], today or timezone.localdate())
+
+
+def is_lot_available(lot, today=None):
+    """`lot` puede ser un `Lots` o su id; no consulta la base de datos."""
+    lot_id = getattr(lot, 'pk', lot)
+    today = today or timezone.localdate()
+    state = _open_maintenances()
+    if lot_id in state['lots'] and _started(state['lots'][lot_id], today):
+        return False
+    console_type_id = state['lot_console_types'].get(lot_id)
+    if console_type_id is None:
+        return True
+    console_types = state['console_types']
+    return console_type_id not in console_types or not _started(console_types[console_type_id], today)
+
+
+def unavailable_console_types(today=None):
+    today = today or timezone.localdate()
+    console_types = _open_maintenances()['console_types']
+    return {console_type_id for console_type_id, start_date in console_types.items() if _started(start_date, today)}
+
+
+def ensure_available(lot, today=None):
+    """`lot` puede ser un `Lots` o su id; solo consulta para armar el mensaje de error."""
+    if is_lot_available(lot, today=today):
+        return
+    if not isinstance(lot, Lots):
+        lot = Lots.objects.select_related('product').get(pk=lot)
+    raise ValidationError(f"La consola {lot.product.name} está en mantenimiento y no puede ser usada.")
@@ -0,0 +1,29 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _key(namespace):
+    return f"gamecenter:version:{namespace}"
+
+
+def get_version(namespace):
+    """Versión actual de un espacio de caché (un valor opaco, solo se compara por igualdad)."""
+    return cache.get_or_set(_key(namespace), time.time_ns, None)
+
+
+def bump_version(namespace, using=None):
+    """
+    Invalida todo lo calculado con la versión anterior del espacio. Dentro de
+    una transacción se aplica al confirmarla; si se revierte, no cambia nada.
+    """
+    transaction.on_commit(lambda: cache.set(_key(namespace), time.time_ns(), None), using=using)
+
+
+def in_transaction(using=None):
+    """
+    Lo que se calcula dentro de una transacción puede incluir cambios sin
+    confirmar: se puede usar, pero no guardarse en caché.
+    """
+    return transaction.get_connection(using).in_atomic_block
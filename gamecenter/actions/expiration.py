@@ -0,0 +1,97 @@
+"""
+Retiro de lotes vencidos de las categorías comestibles.
+
+Los lotes disponibles con `expiration_date` pasada se buscan por el índice
+`lots_state_expiration_idx` en lotes acotados; cada lote se marca como no
+disponible con un solo UPDATE y su saldo en el libro de inventario se da de
+baja como ajuste (los lotes sin movimientos primero abren el libro con su
+`current_stock`). Ambos cambios quedan en el historial de auditoría. Como
+los lotes retirados dejan de estar disponibles, cada barrido solo recorre
+los lotes afectados.
+"""
+import datetime
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from gamecenter import audit
+from gamecenter.actions import inventory
+from gamecenter.models import Lots
+
+DEFAULT_BATCH_SIZE = 500
+PERISHABLE_GROUP = "comestibles"
+
+
+def perishable_lots():
+    return Lots.objects.filter(state="available", product__category__group=PERISHABLE_GROUP)
+
+
+def expired_lots(today=None):
+    """Lotes comestibles disponibles que vencieron antes de `today`."""
+    return perishable_lots().filter(expiration_date__lt=today or timezone.localdate())
+
+
+def retire_batch(today, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Retira un lote de hasta `batch_size` lotes vencidos.
+    Devuelve (lotes retirados, unidades dadas de baja).
+    """
+    with transaction.atomic():
+        lots = expired_lots(today).order_by('expiration_date', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            lots = lots.select_for_update(skip_locked=True, of=('self',))
+        lot_ids = list(lots.values_list('id', flat=True)[:batch_size])
+        if not lot_ids:
+            return 0, 0
+
+        Lots.objects.filter(pk__in=lot_ids).update(state="unavailable", updated_at=timezone.now())
+        audit.record_bulk(Lots, {lot_id: {'state': ["available", "unavailable"]} for lot_id in lot_ids})
+        inventory.bootstrap(lot_ids)
+        balances = inventory.stock_at(lot_ids=lot_ids)
+        written_off = [(lot_id, -balance) for lot_id, balance in balances.items() if balance > 0]
+        inventory.record_adjustment(written_off, observations=f"Vencimiento: baja automática al {today}")
+    return len(lot_ids), -sum(quantity for _, quantity in written_off)
+
+
+def sweep(today=None, batch_size=DEFAULT_BATCH_SIZE, max_batches=None):
+    """Retira lotes vencidos hasta no quedar ninguno (o hasta `max_batches`). Devuelve (lotes, unidades)."""
+    today = today or timezone.localdate()
+    retired = units = batches = 0
+    while max_batches is None or batches < max_batches:
+        lots, lot_units = retire_batch(today, batch_size)
+        if not lots:
+            break
+        retired += lots
+        units += lot_units
+        batches += 1
+    return retired, units
+
+
+def expiring_report(days, today=None, subsidiary_id=None):
+    """
+    Lotes comestibles disponibles que vencen entre `today` y `today + days`,
+    agrupados por sede: [{subsidiary_id, subsidiary, units, lots: [...]}, ...].
+    """
+    today = today or timezone.localdate()
+    lots = perishable_lots().filter(expiration_date__gte=today, expiration_date__lte=today + datetime.timedelta(days=days))
+    if subsidiary_id is not None:
+        lots = lots.filter(subsidiary_id=subsidiary_id)
+    rows = lots.order_by('subsidiary_id', 'expiration_date', 'id').values_list(
+        'subsidiary_id', 'subsidiary__name', 'id', 'lot_number', 'product__name', 'expiration_date', 'current_stock'
+    )
+
+    report = {}
+    for subsidiary, subsidiary_name, lot_id, lot_number, product_name, expiration_date, current_stock in rows:
+        entry = report.setdefault(subsidiary, {
+            'subsidiary_id': subsidiary, 'subsidiary': subsidiary_name, 'units': 0, 'lots': [],
+        })
+        entry['units'] += current_stock or 0
+        entry['lots'].append({
+            'lot_id': lot_id,
+            'lot_number': lot_number,
+            'product': product_name,
+            'expiration_date': expiration_date,
+            'days_left': (expiration_date - today).days,
+            'current_stock': current_stock,
+        })
+    return list(report.values())
@@ -0,0 +1,272 @@
+"""
+Libro de inventario.
+
+Toda variación de stock se registra como `InventoryMovement` (solo inserciones)
+y `Lots.current_stock` queda como una proyección en caché del libro, que se
+actualiza en la misma transacción y se puede reconciliar con `reconcile`.
+
+`take_snapshot` guarda el stock de cada lote al cierre de un día; el stock
+histórico se obtiene con la última foto anterior más los movimientos
+posteriores a ella, sin recorrer todo el libro.
+
+El corte de cada foto es la medianoche por `created_at`, que se asigna en
+Python antes del INSERT: un movimiento fechado a las 23:59:59 puede
+confirmarse después. Por eso la foto de un día solo se toma pasado
+`GAMECENTER_SNAPSHOT_LAG` (segundos, 900 por defecto) desde la medianoche,
+margen que debe superar la transacción más larga que registra movimientos.
+En PostgreSQL además se rechaza la foto mientras siga abierta alguna
+transacción que empezó antes del corte.
+"""
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Exists, F, OuterRef, Sum, Value, When
+from django.utils import timezone
+
+from gamecenter import audit
+from gamecenter.models import InventoryMovement, Lots, StockSnapshot
+
+INTAKE = "ingreso"
+SALE = "venta"
+ADJUSTMENT = "ajuste"
+SESSION = "sesion"
+
+DEFAULT_SNAPSHOT_LAG = 900
+
+
+def record_movements(movements):
+    """
+    Inserta los movimientos con un solo `bulk_create` y aplica la suma por
+    lote a `current_stock` con un solo UPDATE. El UPDATE no pasa por las
+    señales: el cambio se lleva al historial con `audit.record_bulk`, leyendo
+    el valor nuevo de las filas que la transacción ya tiene bloqueadas.
+    """
+    movements = [movement for movement in movements if movement.quantity]
+    if not movements:
+        return []
+
+    missing_product = {movement.lot_id for movement in movements if movement.product_id is None}
+    if missing_product:
+        products = dict(Lots.objects.filter(pk__in=missing_product).values_list('id', 'product_id'))
+        for movement in movements:
+            if movement.product_id is None:
+                movement.product_id = products[movement.lot_id]
+
+    deltas = defaultdict(int)
+    for movement in movements:
+        deltas[movement.lot_id] += movement.quantity
+    deltas = {lot_id: delta for lot_id, delta in deltas.items() if delta}
+
+    with transaction.atomic():
+        created = InventoryMovement.objects.bulk_create(movements)
+        if deltas:
+            Lots.objects.filter(pk__in=deltas).update(current_stock=F('current_stock') + Case(
+                *[When(pk=lot_id, then=Value(delta)) for lot_id, delta in deltas.items()],
+                default=Value(0),
+            ))
+            if Lots in audit.AUDITED_MODELS:
+                audit.record_bulk(Lots, {
+                    lot_id: {'current_stock': [current_stock - deltas[lot_id], current_stock]}
+                    for lot_id, current_stock in Lots.objects.filter(pk__in=deltas).values_list('id', 'current_stock')
+                })
+    return created
+
+
+def _movement(lot, quantity, movement_type, **extra):
+    lot_id = getattr(lot, 'pk', lot)
+    product_id = getattr(lot, 'product_id', None)
+    return InventoryMovement(lot_id=lot_id, product_id=product_id, movement_type=movement_type, quantity=quantity, **extra)
+
+
+def record_intake(entries, observations=""):
+    """entries: iterable de (lote, cantidad recibida)."""
+    return record_movements(
+        _movement(lot, abs(quantity), INTAKE, observations=observations) for lot, quantity in entries
+    )
+
+
+def record_adjustment(entries, observations=""):
+    """entries: iterable de (lote, cantidad con signo)."""
+    return record_movements(
+        _movement(lot, quantity, ADJUSTMENT, observations=observations) for lot, quantity in entries
+    )
+
+
+def record_sale(sale_details):
+    return record_movements(
+        _movement(detail.lot_id, -detail.amount, SALE, sale_detail_id=detail.pk) for detail in sale_details
+    )
+
+
+def record_session_usage(session_lots, release=False):
+    """Cada `SessionLots` ocupa una unidad del lote; con `release=True` se devuelve al terminar la sesión."""
+    quantity = 1 if release else -1
+    return record_movements(
+        _movement(session_lot.lots_id, quantity, SESSION, session_lot_id=session_lot.pk)
+        for session_lot in session_lots
+        if session_lot.lots_id is not None
+    )
+
+
+def end_of_day(day):
+    return timezone.make_aware(datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time.min))
+
+
+def _latest_snapshot(before, **filters):
+    """
+    Última foto con fecha <= `before`: ({lot_id: stock}, {lot_id: product_id}, snapshot_date).
+    Cada foto cubre todos los lotes, así que la fecha se toma de la foto
+    completa y los `filters` solo limitan las filas: un lote sin fila tenía
+    stock 0 y no obliga a buscar una foto más antigua.
+    """
+    stock, products = {}, {}
+    snapshot_date = (
+        StockSnapshot.objects.filter(snapshot_date__lte=before)
+        .order_by('-snapshot_date').values_list('snapshot_date', flat=True).first()
+    )
+    if snapshot_date is None:
+        return stock, products, None
+
+    rows = StockSnapshot.objects.filter(snapshot_date=snapshot_date, **filters).values_list('lot_id', 'product_id', 'stock')
+    for lot_id, product_id, lot_stock in rows:
+        stock[lot_id] = lot_stock
+        products[lot_id] = product_id
+    return stock, products, snapshot_date
+
+
+def _ledger_since(snapshot_date, until=None, **filters):
+    """
+    Movimientos posteriores a la foto de `snapshot_date` (todos si es None).
+    El corte es por `created_at`, no por id: los ids no se confirman en orden
+    y un movimiento con id menor que otro ya fotografiado podría quedar fuera.
+    """
+    movements = InventoryMovement.objects.filter(**filters)
+    if snapshot_date is not None:
+        movements = movements.filter(created_at__gte=end_of_day(snapshot_date))
+    if until is not None:
+        movements = movements.filter(created_at__lt=until)
+    return movements
+
+
+def stock_at(day=None, lot_ids=None, product_id=None):
+    """
+    Stock por lote al cierre de `day` (o actual si `day` es None):
+    última foto hasta esa fecha + movimientos posteriores a ella.
+    """
+    filters = {}
+    if lot_ids is not None:
+        filters['lot_id__in'] = list(lot_ids)
+    if product_id is not None:
+        filters['product_id'] = product_id
+
+    stock, _, snapshot_date = _latest_snapshot(day or timezone.localdate(), **filters)
+    until = end_of_day(day) if day is not None else None
+    rows = (
+        _ledger_since(snapshot_date, until, **filters)
+        .values('lot_id').annotate(total=Sum('quantity')).values_list('lot_id', 'total').order_by()
+    )
+    for lot_id, total in rows:
+        stock[lot_id] = stock.get(lot_id, 0) + total
+    return {lot_id: lot_stock for lot_id, lot_stock in stock.items() if lot_stock}
+
+
+def _open_transactions_since(moment):
+    """En PostgreSQL: ¿sigue abierta otra transacción que empezó antes de `moment`?"""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_stat_activity WHERE datname = current_database() "
+            "AND pid <> pg_backend_pid() AND xact_start < %s LIMIT 1",
+            [moment],
+        )
+        return cursor.fetchone() is not None
+
+
+def take_snapshot(day):
+    """
+    Foto del stock de todos los lotes al cierre de `day`, a partir de la foto
+    anterior y los movimientos del intervalo. Es idempotente: repetirla para
+    el mismo día reemplaza las filas. Solo se fotografían días cerrados hace
+    más de `GAMECENTER_SNAPSHOT_LAG`: la foto cubre hasta la medianoche y las
+    lecturas posteriores parten de ahí, así que un movimiento anterior al
+    corte que se confirme después de la foto se perdería.
+    """
+    until = end_of_day(day)
+    ready_at = until + datetime.timedelta(seconds=getattr(settings, 'GAMECENTER_SNAPSHOT_LAG', DEFAULT_SNAPSHOT_LAG))
+    if timezone.now() < ready_at:
+        raise ValueError(f"La foto del {day} se puede tomar desde {timezone.localtime(ready_at):%Y-%m-%d %H:%M}.")
+    if _open_transactions_since(until):
+        raise ValueError(f"Hay transacciones abiertas desde antes del cierre del {day}; reintenta más tarde.")
+
+    stock, products, snapshot_date = _latest_snapshot(day - datetime.timedelta(days=1))
+    rows = (
+        _ledger_since(snapshot_date, until)
+        .values('lot_id', 'product_id').annotate(total=Sum('quantity'))
+        .values_list('lot_id', 'product_id', 'total').order_by()
+    )
+    for lot_id, product_id, total in rows:
+        stock[lot_id] = stock.get(lot_id, 0) + total
+        products[lot_id] = product_id
+
+    snapshots = [
+        StockSnapshot(lot_id=lot_id, product_id=products[lot_id], snapshot_date=day, stock=lot_stock)
+        for lot_id, lot_stock in stock.items()
+        if lot_stock
+    ]
+    with transaction.atomic():
+        StockSnapshot.objects.filter(snapshot_date=day).delete()
+        StockSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+    return len(snapshots)
+
+
+def reconcile(fix=False):
+    """
+    Compara `current_stock` con el libro. Devuelve {lot_id: (en caché, según libro)}
+    para los lotes que no coinciden y, con `fix=True`, corrige la caché.
+
+    Con `fix=True` los lotes se bloquean antes de leer el libro y se corrigen
+    en la misma transacción: un `record_movements` concurrente espera al
+    bloqueo y suma su delta sobre el valor corregido, o ya confirmó y su
+    movimiento está en el libro leído.
+    """
+    with transaction.atomic():
+        lots = Lots.objects.filter(Exists(InventoryMovement.objects.filter(lot_id=OuterRef('pk'))))
+        if fix:
+            lots = lots.select_for_update().order_by('pk')
+        cached = list(lots.values_list('id', 'current_stock'))
+        ledger = stock_at()
+
+        mismatches = {}
+        for lot_id, current_stock in cached:
+            expected = ledger.get(lot_id, 0)
+            if (current_stock or 0) != expected:
+                mismatches[lot_id] = (current_stock, expected)
+
+        if fix and mismatches:
+            Lots.objects.filter(pk__in=mismatches).update(current_stock=Case(
+                *[When(pk=lot_id, then=Value(expected)) for lot_id, (_, expected) in mismatches.items()],
+            ))
+            audit.record_bulk(Lots, {
+                lot_id: {'current_stock': [cached_stock, expected]} for lot_id, (cached_stock, expected) in mismatches.items()
+            })
+    return mismatches
+
+
+def bootstrap(lot_ids=None):
+    """
+    Abre el libro para los lotes que aún no tienen movimientos (todos, o solo
+    los de `lot_ids`), con su `current_stock` actual como ajuste.
+    """
+    lots = Lots.objects.filter(~Exists(InventoryMovement.objects.filter(lot_id=OuterRef('pk'))), current_stock__gt=0)
+    if lot_ids is not None:
+        lots = lots.filter(pk__in=list(lot_ids))
+    lots = lots.values_list('id', 'product_id', 'current_stock')
+    movements = [
+        InventoryMovement(lot_id=lot_id, product_id=product_id, movement_type=ADJUSTMENT,
+                          quantity=current_stock, observations="Saldo inicial")
+        for lot_id, product_id, current_stock in lots
+    ]
+    return InventoryMovement.objects.bulk_create(movements, batch_size=1000)
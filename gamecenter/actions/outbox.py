@@ -0,0 +1,142 @@
+"""
+Publicación de la bandeja de salida (`OutboxEvent`).
+
+Los eventos se escriben en la misma transacción que el cambio de negocio
+(ver `OutboxModel`; `QuerySet.update()` y los `bulk_*` no los generan);
+aquí solo se drenan en lotes hacia un destino configurable con
+`GAMECENTER_OUTBOX_SINK`:
+
+    GAMECENTER_OUTBOX_SINK = {
+        'BACKEND': 'gamecenter.actions.outbox.FileSink',
+        'OPTIONS': {'path': '/var/lib/gamecenter/outbox.jsonl'},
+    }
+
+Cada lote se toma con `SELECT ... FOR UPDATE SKIP LOCKED`, así que varios
+workers pueden drenar a la vez sin repartirse el mismo evento.
+
+Un evento que falla se reintenta con espera exponencial (`next_attempt_at`):
+5 s, 10 s, 20 s... hasta una hora. Al llegar a `max_attempts` queda aparcado
+hasta que se lo reactive con `retry_parked()` (`drain_outbox --retry-parked`).
+"""
+import datetime
+import json
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from gamecenter.models import OutboxEvent
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_ATTEMPTS = 10
+RETRY_BASE_DELAY = 5  # segundos
+RETRY_MAX_DELAY = 3600
+
+
+class BaseSink:
+    """Destino de los eventos. `deliver` recibe una lista de mensajes y lanza una excepción si falla."""
+
+    def deliver(self, messages):
+        raise NotImplementedError('`deliver()` must be implemented.')
+
+    def close(self):
+        pass
+
+
+class InMemorySink(BaseSink):
+    """Guarda los mensajes en memoria; pensado para pruebas."""
+
+    def __init__(self):
+        self.messages = []
+        self._lock = threading.Lock()
+
+    def deliver(self, messages):
+        with self._lock:
+            self.messages.extend(messages)
+
+
+class FileSink(BaseSink):
+    """Agrega los mensajes a un archivo, uno por línea en JSON."""
+
+    def __init__(self, path=None):
+        self.path = path or settings.BASE_DIR / 'outbox.jsonl'
+
+    def deliver(self, messages):
+        lines = "".join(json.dumps(message, cls=DjangoJSONEncoder) + "\n" for message in messages)
+        with open(self.path, 'a', encoding='utf-8') as output:
+            output.write(lines)
+            output.flush()
+
+
+def get_sink(backend=None, **options):
+    config = getattr(settings, 'GAMECENTER_OUTBOX_SINK', {})
+    if backend is None:
+        # Las opciones configuradas son del destino configurado, no de uno elegido a mano.
+        backend = config.get('BACKEND', 'gamecenter.actions.outbox.FileSink')
+        options = options or config.get('OPTIONS', {})
+    return import_string(backend)(**options)
+
+
+def retry_delay(attempts):
+    """Espera antes del siguiente intento de un evento que ya falló `attempts` veces."""
+    return datetime.timedelta(seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY))
+
+
+def drain_batch(sink, batch_size=DEFAULT_BATCH_SIZE, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Entrega un lote de eventos pendientes. Devuelve (entregados, fallidos).
+    Los eventos que fallaron esperan su `next_attempt_at`; los que llegan a
+    `max_attempts` quedan sin publicar para revisión manual.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True, attempts__lt=max_attempts)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0, 0
+
+        try:
+            sink.deliver([event.as_message() for event in events])
+        except Exception as exc:
+            for event in events:
+                event.attempts += 1
+                event.next_attempt_at = now + retry_delay(event.attempts)
+                event.last_error = f"{type(exc).__name__}: {exc}"
+            OutboxEvent.objects.bulk_update(events, ['attempts', 'next_attempt_at', 'last_error'])
+            return 0, len(events)
+
+        for event in events:
+            event.attempts += 1
+            event.published_at = now
+            event.next_attempt_at = None
+            event.last_error = ""
+        OutboxEvent.objects.bulk_update(events, ['attempts', 'published_at', 'next_attempt_at', 'last_error'])
+        return len(events), 0
+
+
+def retry_parked(max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Reactiva los eventos sin publicar que agotaron sus intentos. Devuelve cuántos."""
+    return OutboxEvent.objects.filter(published_at__isnull=True, attempts__gte=max_attempts).update(
+        attempts=0, next_attempt_at=None
+    )
+
+
+def drain(sink, batch_size=DEFAULT_BATCH_SIZE, max_attempts=DEFAULT_MAX_ATTEMPTS, max_batches=None):
+    """Drena lotes hasta vaciar la bandeja (o hasta `max_batches`). Devuelve (entregados, fallidos)."""
+    delivered = failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        ok, ko = drain_batch(sink, batch_size, max_attempts)
+        delivered += ok
+        failed += ko
+        batches += 1
+        if not ok:
+            break
+    return delivered, failed
@@ -0,0 +1,170 @@
+"""
+Motor de precios con descuentos por membresía.
+
+Las reglas de `MembershipDiscount` se compilan en una tabla en memoria por
+proceso, que se reconstruye solo cuando cambia la versión `membership_discounts`
+(las señales la incrementan al confirmar el alta, cambio o baja de una regla).
+Una tabla compilada dentro de una transacción no se guarda, porque podría
+incluir reglas que luego se reviertan. Cotizar un carrito hace siempre el
+mismo número de consultas, sin importar cuántas líneas tenga.
+"""
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.exceptions import ValidationError
+
+from gamecenter.actions.cache_version import get_version, in_transaction
+from gamecenter.models import Lots, MembershipDiscount, PersonMembership, Price, SaleDetail
+
+VERSION_NAMESPACE = 'membership_discounts'
+
+CENT = Decimal('0.01')
+HUNDRED = Decimal(100)
+ZERO = Decimal('0.00')
+
+PricedLine = namedtuple('PricedLine', ['lot', 'amount', 'unit_price', 'discount', 'subtotal', 'percentage'])
+
+# Reglas de un tipo de membresía: (general, {category_id: %}, {product_id: %})
+_EMPTY_RULES = (None, {}, {})
+
+_compiled = {'version': None, 'table': {}}
+
+
+def compile_discount_table():
+    """Lee las reglas activas y arma {membership_type_id: (general, por_categoría, por_producto)}."""
+    table = {}
+    rules = MembershipDiscount.objects.filter(is_active=True).values_list(
+        'membership_type_id', 'category_id', 'product_id', 'percentage'
+    )
+    for membership_type_id, category_id, product_id, percentage in rules:
+        entry = table.setdefault(membership_type_id, [None, {}, {}])
+        if product_id is not None:
+            entry[2][product_id] = max(percentage, entry[2].get(product_id, percentage))
+        elif category_id is not None:
+            entry[1][category_id] = max(percentage, entry[1].get(category_id, percentage))
+        else:
+            entry[0] = percentage if entry[0] is None else max(entry[0], percentage)
+    return {key: tuple(entry) for key, entry in table.items()}
+
+
+def get_discount_table():
+    version = get_version(VERSION_NAMESPACE)
+    if _compiled['version'] == version:
+        return _compiled['table']
+    table = compile_discount_table()
+    if not in_transaction():
+        _compiled['table'], _compiled['version'] = table, version
+    return table
+
+
+def resolve_membership_types(client):
+    client_id = getattr(client, 'pk', client)
+    if client_id is None:
+        return ()
+    return tuple(
+        PersonMembership.objects.filter(person_id=client_id)
+        .values_list('membership_type_id', flat=True)
+        .distinct()
+    )
+
+
+class Checkout:
+    """
+    Cotización de un carrito para un cliente.
+
+    Las membresías del cliente se resuelven una sola vez al crear el objeto;
+    `discount_percentage` se memoriza por (producto, categoría).
+    """
+
+    def __init__(self, client=None):
+        table = get_discount_table()
+        self.rules = [table.get(membership_type_id, _EMPTY_RULES) for membership_type_id in resolve_membership_types(client)]
+        self._percentages = {}
+
+    def discount_percentage(self, product_id, category_id):
+        key = (product_id, category_id)
+        try:
+            return self._percentages[key]
+        except KeyError:
+            pass
+
+        best = ZERO
+        for general, by_category, by_product in self.rules:
+            percentage = by_product.get(product_id)
+            if percentage is None:
+                percentage = by_category.get(category_id, general)
+            if percentage is not None and percentage > best:
+                best = percentage
+        self._percentages[key] = best
+        return best
+
+    def price_line(self, lot, amount, unit_price):
+        percentage = self.discount_percentage(lot.product_id, lot.product.category_id)
+        gross = unit_price * amount
+        discount = (gross * percentage / HUNDRED).quantize(CENT, rounding=ROUND_HALF_UP)
+        return PricedLine(lot, amount, unit_price, discount, gross - discount, percentage)
+
+    def price(self, lines):
+        """
+        lines: iterable de (lot_id, cantidad).
+        Devuelve una lista de PricedLine en el mismo orden.
+        """
+        lines = [(int(lot_id), int(amount)) for lot_id, amount in lines]
+        invalid = sorted({lot_id for lot_id, amount in lines if amount < 1})
+        if invalid:
+            raise ValidationError(f"La cantidad debe ser al menos 1 (lotes: {', '.join(map(str, invalid))})")
+        lots = Lots.objects.select_related('price', 'product').in_bulk({lot_id for lot_id, _ in lines})
+
+        missing = {lot_id for lot_id, _ in lines if lot_id not in lots}
+        if missing:
+            raise ValidationError(f"No existen los lotes: {', '.join(map(str, sorted(missing)))}")
+
+        fallback_prices = self._fallback_prices(
+            lot for lot in lots.values() if lot.price is None or not lot.price.is_active
+        )
+
+        priced = []
+        for lot_id, amount in lines:
+            lot = lots[lot_id]
+            if lot.price is not None and lot.price.is_active:
+                unit_price = lot.price.sale_price
+            else:
+                unit_price = fallback_prices.get(lot.product_id)
+            if unit_price is None:
+                raise ValidationError(f"No hay precio definido para {lot.product.name}")
+            priced.append(self.price_line(lot, amount, unit_price))
+        return priced
+
+    def _fallback_prices(self, lots):
+        """Precio unitario activo del producto para lotes sin precio propio (una consulta)."""
+        product_ids = {lot.product_id for lot in lots}
+        if not product_ids:
+            return {}
+        prices = {}
+        rows = (
+            Price.objects.filter(product_id__in=product_ids, unit_measurement="unidad", is_active=True)
+            .order_by('product_id', '-created_at')
+            .values_list('product_id', 'sale_price')
+        )
+        for product_id, sale_price in rows:
+            prices.setdefault(product_id, sale_price)
+        return prices
+
+
+def price_cart(client, lines):
+    return Checkout(client).price(lines)
+
+
+def build_sale_details(sale, priced_lines):
+    """SaleDetail sin guardar, listos para `bulk_create`."""
+    return [
+        SaleDetail(
+            sale=sale,
+            lot=line.lot,
+            amount=line.amount,
+            unit_price=line.unit_price,
+            discount=line.discount,
+            subtotal=line.subtotal,
+        )
+        for line in priced_lines
+    ]
@@ -0,0 +1,500 @@
+"""
+Generador de datos sintéticos para pruebas de carga.
+
+Las tablas de referencia (sedes, tipos de consola, productos, precios, lotes,
+usuarios) se crean en el proceso principal. Las tablas grandes se reparten en
+tareas independientes: cada tarea conoce de antemano los ids que le tocan
+(se asignan de forma explícita a partir del máximo id actual), genera sus
+filas con una semilla propia y las escribe con `COPY` en PostgreSQL o con
+INSERT por lotes en los demás motores. Así varias tareas pueden correr en
+procesos distintos sin coordinarse.
+
+Al final `seed_inventory` abre el libro de inventario de los lotes generados
+(un ingreso por lote y una venta por detalle), así `reconcile` no encuentra
+diferencias y el stock histórico sale de las fotos como en producción.
+"""
+import csv
+import datetime
+import io
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Case, F, Max, Sum, Value, When
+from django.utils import timezone
+
+from gamecenter.actions import inventory
+from gamecenter.models import (
+    Category, ConsoleReservations, ConsoleType, InventoryMovement, LocalSettings, Lots, OpeningSalesBox, Person,
+    Price, Product, Sale, SaleBoxMovement, SaleDetail, Session, SessionLots, Subsidiary, User,
+)
+
+# Filas por unidad de --scale. Con el libro de inventario, scale=1 son ~17 400 filas y scale=750 unos 13 millones.
+PER_SCALE = {
+    'persons': 1000,
+    'opening_sales_boxes': 100,
+    'sessions': 2000,
+    'reservations': 300,
+    'sales': 2000,
+}
+DETAILS_PER_SALE = 2
+
+CONSOLE_TYPES = ["PlayStation 5", "Xbox Series X", "PC Gamer", "Nintendo Switch"]
+FOOD = {
+    "Snacks": ["Papas", "Galletas", "Chocolate", "Maní", "Canchita"],
+    "Bebidas": ["Gaseosa", "Agua", "Energizante", "Jugo", "Café"],
+}
+FIRST_NAMES = ["Ana", "Luis", "María", "José", "Lucía", "Diego", "Sofía", "Carlos", "Valeria", "Jorge"]
+LAST_NAMES = ["Quispe", "Flores", "Sánchez", "Rojas", "García", "Huamán", "Torres", "Mendoza", "Vargas", "Castillo"]
+PAYMENT_METHODS = ["efectivo", "tarjeta", "transferencia"]
+CENT = Decimal("0.01")
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+
+def build_plan(scale, subsidiaries, days, seed):
+    """Cantidades, primer id de cada tabla y fecha de referencia del conjunto."""
+    counts = {name: per_scale * scale for name, per_scale in PER_SCALE.items()}
+    counts['subsidiaries'] = subsidiaries
+    first_ids = {
+        'persons': next_id(Person),
+        'opening_sales_boxes': next_id(OpeningSalesBox),
+        'sessions': next_id(Session),
+        'session_lots': next_id(SessionLots),
+        'reservations': next_id(ConsoleReservations),
+        'sales': next_id(Sale),
+        'sale_details': next_id(SaleDetail),
+        'sale_box_movements': next_id(SaleBoxMovement),
+    }
+    return {
+        'seed': seed,
+        'days': days,
+        'now': timezone.now().replace(minute=0, second=0, microsecond=0),
+        'counts': counts,
+        'first_ids': first_ids,
+        # Etiqueta de la corrida para los campos únicos (nombres, usernames, lotes).
+        'tag': first_ids['persons'],
+    }
+
+
+def create_reference_data(plan):
+    """Tablas pequeñas, en el proceso principal. Completa `plan` con los ids que usan las tareas."""
+    rng = random.Random(plan['seed'])
+    tag = plan['tag']
+    today = timezone.localdate()
+    # Los comestibles se venden durante todo el periodo: entran antes de la primera venta.
+    food_entry = (plan['now'] - datetime.timedelta(days=plan['days'] + 1)).date()
+
+    with transaction.atomic():
+        subsidiaries = []
+        for index in range(plan['counts']['subsidiaries']):
+            local_setting = LocalSettings.objects.create(currency="PEN", minimum_time_sessions=30)
+            subsidiaries.append(Subsidiary.objects.create(
+                name=f"Sede {index + 1} #{tag}",
+                address=f"Av. Principal {100 + index}",
+                contact_number=f"01{rng.randrange(1000000, 9999999)}",
+                date_opened=today - datetime.timedelta(days=rng.randrange(365, 3650)),
+                local_setting=local_setting,
+                is_main=index == 0,
+            ))
+
+        consoles = Category.objects.create(name=f"Consolas #{tag}", group="dispositivos")
+        accessories = Category.objects.create(name=f"Mandos #{tag}", group="accesorios")
+        food_categories = {name: Category.objects.create(name=f"{name} #{tag}", group="comestibles") for name in FOOD}
+
+        console_lots, food_lots = [], []
+        for console_name in CONSOLE_TYPES:
+            console_type = ConsoleType.objects.create(name=f"{console_name} #{tag}")
+            console = Product.objects.create(name=console_type.name, category=consoles, console_type=console_type)
+            hourly = Price.objects.create(product=console, unit_measurement="hora",
+                                          sale_price=Decimal(rng.choice([5, 6, 8, 10])), purchase_price=Decimal(0))
+            controller = Product.objects.create(name=f"Mando {console_type.name}", category=accessories,
+                                                console_type=console_type)
+            Price.objects.create(product=controller, unit_measurement="unidad", sale_price=Decimal(3), purchase_price=Decimal(0))
+            for subsidiary in subsidiaries:
+                units = rng.randrange(4, 12)
+                console_lots.append(Lots.objects.create(
+                    product=console, lot_number=f"{subsidiary.id}", subsidiary=subsidiary, price=hourly,
+                    initial_stock=units, current_stock=units, state="available", entry_date=subsidiary.date_opened,
+                ).id)
+
+        for category_name, names in FOOD.items():
+            for name in names:
+                product = Product.objects.create(name=name, category=food_categories[category_name])
+                purchase = Decimal(rng.randrange(50, 500)) / 100
+                price = Price.objects.create(product=product, unit_measurement="unidad",
+                                             sale_price=(purchase * Decimal("1.6")).quantize(CENT), purchase_price=purchase)
+                for subsidiary in subsidiaries:
+                    stock = rng.randrange(50, 500)
+                    food_lots.append((Lots.objects.create(
+                        product=product, lot_number=f"{subsidiary.id}-1", subsidiary=subsidiary, price=price,
+                        initial_stock=stock, current_stock=stock, state="available", entry_date=food_entry,
+                        manufacturing_date=today - datetime.timedelta(days=rng.randrange(1, 60)),
+                        expiration_date=today + datetime.timedelta(days=rng.randrange(-10, 180)),
+                    ).id, price.sale_price))
+
+        # Cajeros: las primeras personas del rango, con un usuario cada uno.
+        password = make_password("gamecenter")
+        first_person = plan['first_ids']['persons']
+        cashiers = list(range(first_person, first_person + min(10 * len(subsidiaries), plan['counts']['persons'])))
+
+    plan['console_lots'] = console_lots
+    plan['food_lots'] = [(lot_id, str(price)) for lot_id, price in food_lots]
+    plan['cashiers'] = cashiers
+    plan['subsidiaries'] = [subsidiary.id for subsidiary in subsidiaries]
+    plan['password'] = password
+    return plan
+
+
+def create_users(plan):
+    """Usuarios de los cajeros; se crean después de cargar las personas."""
+    subsidiaries = plan['subsidiaries']
+    User.objects.bulk_create([
+        User(username=f"cajero{person_id}", password=plan['password'], person_id=person_id,
+             subsidiary_id=subsidiaries[index % len(subsidiaries)])
+        for index, person_id in enumerate(plan['cashiers'])
+    ], batch_size=1000)
+
+
+def _rng(plan, kind, start):
+    return random.Random(f"{plan['seed']}:{kind}:{start}")
+
+
+def _moment(rng, plan):
+    return plan['now'] - datetime.timedelta(seconds=rng.randrange(plan['days'] * 86400))
+
+
+def generate_persons(plan, start, count):
+    rng = _rng(plan, 'persons', start)
+    first_id = plan['first_ids']['persons']
+    rows = []
+    for index in range(start, start + count):
+        created = _moment(rng, plan)
+        rows.append({
+            'id': first_id + index,
+            'created_at': created,
+            'updated_at': created,
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': f"{rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'email': f"cliente{first_id + index}@example.com" if rng.random() < 0.7 else None,
+            'dni': f"{rng.randrange(10000000, 99999999)}",
+            'phone': f"9{rng.randrange(10000000, 99999999)}" if rng.random() < 0.8 else None,
+        })
+    return {Person: rows}
+
+
+def _person(rng, plan):
+    return plan['first_ids']['persons'] + rng.randrange(plan['counts']['persons'])
+
+
+def generate_opening_sales_boxes(plan, start, count):
+    rng = _rng(plan, 'opening_sales_boxes', start)
+    first_id = plan['first_ids']['opening_sales_boxes']
+    rows = []
+    for index in range(start, start + count):
+        opened = _moment(rng, plan)
+        opening_amount = Decimal(rng.randrange(100, 500))
+        rows.append({
+            'id': first_id + index,
+            'created_at': opened,
+            'updated_at': opened,
+            'user_id': rng.choice(plan['cashiers']),
+            'opening_date': opened.date(),
+            'opening_amount': opening_amount,
+            'closing_date': opened.date(),
+            'closing_amount': opening_amount + Decimal(rng.randrange(0, 3000)),
+            'date': opened.date(),
+        })
+    return {OpeningSalesBox: rows}
+
+
+def generate_sessions(plan, start, count):
+    rng = _rng(plan, 'sessions', start)
+    first_id = plan['first_ids']['sessions']
+    first_session_lot_id = plan['first_ids']['session_lots']
+    sessions, session_lots = [], []
+    for index in range(start, start + count):
+        started = _moment(rng, plan)
+        minutes = rng.choice([30, 60, 60, 90, 120, 180, 240])
+        ended = started + datetime.timedelta(minutes=minutes)
+        hours = (Decimal(minutes) / 60).quantize(CENT)
+        sessions.append({
+            'id': first_id + index,
+            'created_at': started,
+            'updated_at': ended,
+            'client_id': _person(rng, plan),
+            'hour_count': hours,
+            'session_date': started.date(),
+            'start_time': started,
+            'end_time': ended,
+            'total_amount': (hours * 6).quantize(CENT),
+            'accessory_amount': Decimal("0.00"),
+            'state': "finalizado",
+        })
+        session_lots.append({
+            'id': first_session_lot_id + index,
+            'created_at': started,
+            'updated_at': started,
+            'session_id': first_id + index,
+            'lots_id': rng.choice(plan['console_lots']),
+        })
+    return {Session: sessions, SessionLots: session_lots}
+
+
+def generate_reservations(plan, start, count):
+    rng = _rng(plan, 'reservations', start)
+    first_id = plan['first_ids']['reservations']
+    rows = []
+    for index in range(start, start + count):
+        booked = _moment(rng, plan)
+        begins = booked + datetime.timedelta(hours=rng.randrange(1, 72))
+        hours = rng.choice([1, 2, 3])
+        rows.append({
+            'id': first_id + index,
+            'created_at': booked,
+            'updated_at': booked,
+            'client_id': _person(rng, plan),
+            'lots_id': rng.choice(plan['console_lots']),
+            'reservation_date': booked.date(),
+            'hour_count': Decimal(hours),
+            'start_hour': begins,
+            'end_hour': begins + datetime.timedelta(hours=hours),
+            'accessory_count': 2,
+            'state': rng.choice(["reservado", "completado", "completado", "cancelado"]),
+            'advance_payment': Decimal(rng.choice([0, 5, 10])),
+        })
+    return {ConsoleReservations: rows}
+
+
+def generate_sales(plan, start, count):
+    rng = _rng(plan, 'sales', start)
+    first_id = plan['first_ids']['sales']
+    first_detail_id = plan['first_ids']['sale_details']
+    first_movement_id = plan['first_ids']['sale_box_movements']
+    first_box_id = plan['first_ids']['opening_sales_boxes']
+    sales, details, movements = [], [], []
+    for index in range(start, start + count):
+        sold = _moment(rng, plan)
+        sale_id = first_id + index
+        subtotal = Decimal("0.00")
+        for line in range(DETAILS_PER_SALE):
+            lot_id, unit_price = rng.choice(plan['food_lots'])
+            unit_price = Decimal(unit_price)
+            amount = rng.randrange(1, 4)
+            line_total = unit_price * amount
+            subtotal += line_total
+            details.append({
+                'id': first_detail_id + index * DETAILS_PER_SALE + line,
+                'created_at': sold,
+                'updated_at': sold,
+                'sale_id': sale_id,
+                'lot_id': lot_id,
+                'amount': amount,
+                'unit_price': unit_price,
+                'discount': Decimal("0.00"),
+                'subtotal': line_total,
+            })
+        igv = (subtotal * Decimal("0.18")).quantize(CENT)
+        sales.append({
+            'id': sale_id,
+            'created_at': sold,
+            'updated_at': sold,
+            'client_id': _person(rng, plan),
+            'user_id': rng.choice(plan['cashiers']),
+            'session_id': None,
+            'date_sale': sold.date(),
+            'subtotal': subtotal,
+            'igv': igv,
+            'total': subtotal + igv,
+            'payment_method': rng.choice(PAYMENT_METHODS),
+            'state': "completado",
+        })
+        movements.append({
+            'id': first_movement_id + index,
+            'created_at': sold,
+            'updated_at': sold,
+            'opening_sales_box_id': first_box_id + rng.randrange(plan['counts']['opening_sales_boxes']),
+            'sale_id': sale_id,
+            'movement_type': "entrada",
+            'amount': subtotal + igv,
+            'movement_date': sold.date(),
+            'is_active': True,
+        })
+    return {Sale: sales, SaleDetail: details, SaleBoxMovement: movements}
+
+
+GENERATORS = {
+    'persons': generate_persons,
+    'opening_sales_boxes': generate_opening_sales_boxes,
+    'sessions': generate_sessions,
+    'reservations': generate_reservations,
+    'sales': generate_sales,
+}
+
+# Las tareas de una fase solo dependen de filas de fases anteriores: en PostgreSQL
+# cada tarea confirma por su cuenta y las claves foráneas se comprueban al confirmar.
+PHASES = [
+    ['persons'],
+    ['opening_sales_boxes', 'sessions', 'reservations'],
+    ['sales'],
+]
+
+
+def tasks_for(plan, kinds, chunk_size):
+    return [
+        (kind, start, min(chunk_size, plan['counts'][kind] - start))
+        for kind in kinds
+        for start in range(0, plan['counts'][kind], chunk_size)
+    ]
+
+
+def _copy_value(value):
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def copy_rows(model, rows):
+    """Carga con COPY ... FROM STDIN (PostgreSQL)."""
+    fields = model._meta.concrete_fields
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[field.attname]) for field in fields])
+    buffer.seek(0)
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+
+
+def insert_rows(model, rows, batch_size):
+    """
+    INSERT con `executemany` en los demás motores. No se usa `bulk_create`
+    porque llama a `pre_save` y los campos auto_now/auto_now_add (created_at,
+    session_date, date_sale...) quedarían todos con la fecha de hoy.
+    """
+    fields = model._meta.concrete_fields
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    placeholders = ", ".join(["%s"] * len(fields))
+    sql = f"INSERT INTO {connection.ops.quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})"
+    with connection.cursor() as cursor:
+        for offset in range(0, len(rows), batch_size):
+            cursor.executemany(sql, [
+                [field.get_db_prep_save(row[field.attname], connection) for field in fields]
+                for row in rows[offset:offset + batch_size]
+            ])
+
+
+def write_rows(model, rows, batch_size):
+    if connection.vendor == 'postgresql':
+        copy_rows(model, rows)
+    else:
+        insert_rows(model, rows, batch_size)
+
+
+def run_task(plan, task, batch_size):
+    kind, start, count = task
+    generated = GENERATORS[kind](plan, start, count)
+    with transaction.atomic():
+        for model, rows in generated.items():
+            write_rows(model, rows, batch_size)
+    return {model._meta.model_name: len(rows) for model, rows in generated.items()}
+
+
+def _ledger_row(movement_id, moment, lot_id, product_id, movement_type, quantity, sale_detail_id=None, observations=""):
+    return {
+        'id': movement_id,
+        'created_at': moment,
+        'updated_at': moment,
+        'lot_id': lot_id,
+        'product_id': product_id,
+        'movement_type': movement_type,
+        'quantity': quantity,
+        'sale_detail_id': sale_detail_id,
+        'session_lot_id': None,
+        'observations': observations,
+    }
+
+
+def seed_inventory(plan, batch_size):
+    """
+    Libro de inventario de los lotes generados, en el proceso principal y en
+    orden cronológico. Cada lote recibe un ingreso por `initial_stock` antes del
+    periodo y cada detalle de venta un movimiento negativo. `initial_stock` se
+    sube en lo vendido, así `current_stock` (lo sorteado) queda igual al saldo
+    del libro sin volverse negativo. Las sesiones terminadas devuelven su
+    consola y no cambian el saldo. Devuelve la cantidad de movimientos.
+    """
+    first_detail_id = plan['first_ids']['sale_details']
+    details = SaleDetail.objects.filter(
+        pk__gte=first_detail_id, pk__lt=first_detail_id + plan['counts']['sales'] * DETAILS_PER_SALE,
+    )
+    sold = dict(details.values('lot_id').annotate(units=Sum('amount')).values_list('lot_id', 'units').order_by())
+    lot_ids = plan['console_lots'] + [lot_id for lot_id, _ in plan['food_lots']]
+    opened = plan['now'] - datetime.timedelta(days=plan['days'] + 1)
+    movement_id = next_id(InventoryMovement)
+
+    with transaction.atomic():
+        if sold:
+            Lots.objects.filter(pk__in=sold).update(initial_stock=F('current_stock') + Case(
+                *[When(pk=lot_id, then=Value(units)) for lot_id, units in sold.items()],
+                default=Value(0),
+            ))
+
+        products, rows = {}, []
+        for lot_id, product_id, initial_stock in Lots.objects.filter(pk__in=lot_ids).order_by('id').values_list(
+            'id', 'product_id', 'initial_stock'
+        ):
+            products[lot_id] = product_id
+            rows.append(_ledger_row(movement_id, opened, lot_id, product_id, inventory.INTAKE, initial_stock,
+                                    observations="Ingreso inicial (datos sintéticos)"))
+            movement_id += 1
+        write_rows(InventoryMovement, rows, batch_size)
+        written = len(rows)
+
+        rows = []
+        sales = details.order_by('created_at', 'id').values_list('id', 'lot_id', 'amount', 'created_at')
+        for detail_id, lot_id, amount, sold_at in sales.iterator(chunk_size=batch_size):
+            rows.append(_ledger_row(movement_id, sold_at, lot_id, products[lot_id], inventory.SALE, -amount, detail_id))
+            movement_id += 1
+            if len(rows) >= batch_size:
+                write_rows(InventoryMovement, rows, batch_size)
+                written += len(rows)
+                rows = []
+        write_rows(InventoryMovement, rows, batch_size)
+    return written + len(rows)
+
+
+def init_worker():
+    """Cada proceso abre sus propias conexiones; las heredadas del padre no se pueden compartir."""
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def worker(args):
+    return run_task(*args)
+
+
+def reset_sequences():
+    """Tras insertar ids explícitos, las secuencias de PostgreSQL deben avanzar."""
+    models = [
+        Person, OpeningSalesBox, Session, SessionLots, ConsoleReservations, Sale, SaleDetail, SaleBoxMovement,
+        InventoryMovement,
+    ]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
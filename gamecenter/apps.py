@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GamecenterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gamecenter'
+
+    def ready(self):
+        from gamecenter import checks, signals  # noqa: F401
@@ -0,0 +1,282 @@
+"""
+Historial de cambios por campo (`AuditEntry`) con escritura diferida.
+
+Las señales de `gamecenter.signals` toman una foto de los campos al cargar
+cada instancia auditada (`post_init`), calculan la diferencia en `pre_save`
+y registran la entrada en `post_save`/`post_delete`. La entrada no se
+inserta en ese momento: se acumula cuando la transacción confirma (las de
+una transacción revertida se descartan) y se escribe después:
+
+- `AuditMiddleware` (o `batch()` fuera de una petición) junta todo lo
+  confirmado y lo escribe con un solo `bulk_create` al terminar.
+- Con `GAMECENTER_AUDIT['MODE'] = 'thread'` las entradas pasan a un hilo
+  escritor con una cola acotada; si la cola está llena, quien guarda
+  escribe él mismo, así la cola no crece sin límite. Si el INSERT falla, el
+  hilo lo reintenta con espera creciente; si la base de datos sigue sin
+  responder, las entradas se registran en el log con su contenido y se
+  descartan. Lo que quede en la cola al cerrar el proceso pasado el
+  `timeout` de `close()` también se pierde.
+
+`QuerySet.update()` y `bulk_create()` no pasan por las señales: quien
+escribe en bloque sobre un modelo auditado registra el cambio con
+`record_bulk` (lo hacen `inventory.record_movements`, `inventory.reconcile` y
+el retiro de lotes vencidos para `current_stock` y `state` de `Lots`).
+Cualquier otro `update()` no queda en el historial.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from gamecenter.models import AuditEntry, Lots, OpeningSalesBox, Price, Sale, User
+
+logger = logging.getLogger(__name__)
+
+AUDITED_MODELS = (Price, Lots, Sale, OpeningSalesBox, User)
+IGNORED_FIELDS = {'created_at', 'updated_at', 'last_login'}
+MASKED_FIELDS = {'password'}
+MASK = "********"
+
+_fields = {}
+# .buffer: lista de entradas confirmadas mientras hay un `batch()` abierto; .request: petición en curso.
+_local = threading.local()
+
+
+def tracked_fields(model):
+    names = _fields.get(model)
+    if names is None:
+        names = _fields[model] = tuple(
+            field.attname for field in model._meta.concrete_fields if field.attname not in IGNORED_FIELDS
+        )
+    return names
+
+
+def _json_value(name, value):
+    if value is not None and name in MASKED_FIELDS:
+        return MASK
+    if hasattr(value, 'resolve_expression'):  # F(), Case()... asignados antes de guardar
+        return str(value)
+    return value
+
+
+def snapshot(instance):
+    """Guarda los valores cargados; los campos diferidos no están en `__dict__` y se omiten."""
+    values = instance.__dict__
+    instance._audit_snapshot = {name: values[name] for name in tracked_fields(type(instance)) if name in values}
+
+
+def capture(instance, update_fields=None):
+    """Diferencia {campo: [antes, después]} contra la foto, limitada a `update_fields` si se indicó."""
+    if instance._state.adding:
+        instance._audit_changes = None
+        return
+    before = getattr(instance, '_audit_snapshot', {})
+    values = instance.__dict__
+    names = tracked_fields(type(instance))
+    if update_fields is not None:
+        names = [name for name in names if name in update_fields or name.removesuffix('_id') in update_fields]
+    instance._audit_changes = {
+        name: [before[name], values[name]]
+        for name in names
+        if name in before and name in values and before[name] != values[name]
+    }
+
+
+def record_save(instance, created):
+    if created:
+        values = instance.__dict__
+        changes = {name: [None, values[name]] for name in tracked_fields(type(instance)) if values.get(name) is not None}
+        record(instance, "created", changes)
+        snapshot(instance)
+        return
+
+    changes = getattr(instance, '_audit_changes', None)
+    if changes:
+        record(instance, "updated", changes)
+        for name, (_, new) in changes.items():
+            if hasattr(new, 'resolve_expression'):
+                # El valor real quedó en la base de datos; sin foto, el próximo save no lo compara.
+                instance._audit_snapshot.pop(name, None)
+            else:
+                instance._audit_snapshot[name] = new
+    instance._audit_changes = None
+
+
+def record_delete(instance):
+    values = instance.__dict__
+    changes = {name: [values[name], None] for name in tracked_fields(type(instance)) if values.get(name) is not None}
+    record(instance, "deleted", changes)
+
+
+def _current_user_id():
+    user = getattr(getattr(_local, 'request', None), 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def _entry(model, object_id, action, changes, user_id, changed_at):
+    return AuditEntry(
+        model=model._meta.model_name,
+        object_id=str(object_id),
+        action=action,
+        changes={name: [_json_value(name, old), _json_value(name, new)] for name, (old, new) in changes.items()},
+        user_id=user_id,
+        changed_at=changed_at,
+    )
+
+
+def record(instance, action, changes):
+    entry = _entry(type(instance), instance.pk, action, changes, _current_user_id(), timezone.now())
+    _enqueue([entry], instance._state.db)
+
+
+def record_bulk(model, changes, action="updated", using=None):
+    """
+    Historial de una escritura en bloque (`QuerySet.update()`), que no pasa por
+    las señales. `changes` es {pk: {campo: [antes, después]}}.
+    """
+    if model not in AUDITED_MODELS or not changes:
+        return
+    user_id, changed_at = _current_user_id(), timezone.now()
+    _enqueue([
+        _entry(model, pk, action, fields, user_id, changed_at) for pk, fields in changes.items() if fields
+    ], using)
+
+
+def _enqueue(entries, using):
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(lambda: _committed(entries), using=using)
+    else:
+        _committed(entries)
+
+
+def _committed(entries):
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is not None:
+        buffer.extend(entries)
+    else:
+        write(entries)
+
+
+def write(entries):
+    if get_config().get('MODE', 'commit') == 'thread':
+        get_writer().submit(entries)
+    else:
+        AuditEntry.objects.bulk_create(entries)
+
+
+@contextmanager
+def batch(request=None):
+    """Junta las entradas confirmadas dentro del bloque y las escribe juntas al salir."""
+    if getattr(_local, 'buffer', None) is not None:
+        yield
+        return
+    _local.buffer, _local.request = [], request
+    try:
+        yield
+    finally:
+        entries = _local.buffer
+        _local.buffer = _local.request = None
+        if entries:
+            write(entries)
+
+
+class AuditMiddleware:
+    """Un `batch()` por petición: el historial de toda la petición sale en un solo INSERT."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with batch(request):
+            return self.get_response(request)
+
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Hilo que escribe el historial en lotes desde una cola acotada."""
+
+    def __init__(self, queue_size=10000, batch_size=500, put_timeout=0.5, retries=3, retry_delay=0.5):
+        self.queue = queue.Queue(queue_size)
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.thread = threading.Thread(target=self.run, name="audit-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, entries):
+        for index, entry in enumerate(entries):
+            try:
+                self.queue.put(entry, timeout=self.put_timeout)
+            except queue.Full:
+                # Contrapresión: si el hilo no da abasto, el resto lo escribe quien guarda.
+                AuditEntry.objects.bulk_create(entries[index:])
+                return
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            entry = self.queue.get()
+            if entry is _STOP:
+                break
+            entries = [entry]
+            while len(entries) < self.batch_size:
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                entries.append(entry)
+            self.write(entries)
+        connection.close()
+
+    def write(self, entries):
+        """`bulk_create` es atómico: tras un fallo no quedó ninguna fila y se puede reintentar."""
+        for attempt in range(self.retries + 1):
+            try:
+                AuditEntry.objects.bulk_create(entries)
+                return True
+            except Exception:
+                # La conexión puede haber quedado rota; el siguiente intento abre otra.
+                connection.close()
+                if attempt < self.retries:
+                    time.sleep(self.retry_delay * 2 ** attempt)
+                    continue
+                logger.exception(
+                    "No se pudieron escribir %d entradas de auditoría tras %d intentos; se descartan: %s",
+                    len(entries), self.retries + 1,
+                    [(entry.model, entry.object_id, entry.action, entry.changes, entry.user_id, entry.changed_at.isoformat())
+                     for entry in entries],
+                )
+        return False
+
+    def close(self, timeout=5):
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+
+
+_writer = {'instance': None}
+_writer_lock = threading.Lock()
+
+
+def get_config():
+    return getattr(settings, 'GAMECENTER_AUDIT', {})
+
+
+def get_writer():
+    if _writer['instance'] is None:
+        with _writer_lock:
+            if _writer['instance'] is None:
+                _writer['instance'] = AuditWriter(**get_config().get('OPTIONS', {}))
+                atexit.register(_writer['instance'].close)
+    return _writer['instance']
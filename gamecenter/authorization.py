@@ -0,0 +1,105 @@
+"""
+Resolución en caché de permisos y alcance por sede.
+
+El conjunto efectivo de permisos de un usuario y la sede a la que está
+limitado se calculan una vez y se guardan en la caché de Django bajo una
+clave que incluye dos versiones: la global `authz` (grupos, permisos, sedes)
+y la del propio usuario `authz:user:<id>`. Las señales de `gamecenter.signals`
+incrementan la versión que corresponda al confirmarse el cambio. Además cada
+entrada vence a los `GAMECENTER_AUTHZ_CACHE_TIMEOUT` segundos (300 por defecto).
+
+Dentro de una transacción el alcance se resuelve siempre contra la base de
+datos y no se guarda: podría incluir grupos o permisos que luego se reviertan.
+"""
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db.models import Q
+
+from gamecenter.actions.cache_version import get_version, in_transaction
+from gamecenter.models import Subsidiary
+
+GLOBAL_NAMESPACE = 'authz'
+DEFAULT_TIMEOUT = 300
+
+# Solo los superusuarios y los usuarios de la sede principal ven todas las sedes
+# (all_subsidiaries). Los demás ven la suya; sin sede asignada no ven ninguna.
+UserScope = namedtuple('UserScope', ['user_id', 'permissions', 'subsidiary_id', 'all_subsidiaries'])
+
+ANONYMOUS_SCOPE = UserScope(None, frozenset(), None, False)
+
+# Copia local por proceso para no deserializar desde la caché en cada consulta: {clave: (vence, alcance)}
+_LOCAL_LIMIT = 10000
+_local = {}
+
+
+def get_timeout():
+    return getattr(settings, 'GAMECENTER_AUTHZ_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def user_namespace(user_id):
+    return f"{GLOBAL_NAMESPACE}:user:{user_id}"
+
+
+def _cache_key(user_id):
+    return f"gamecenter:authz:v2:{user_id}:{get_version(GLOBAL_NAMESPACE)}:{get_version(user_namespace(user_id))}"
+
+
+def resolve_user_scope(user):
+    """Calcula el alcance contra la base de datos, sin caché."""
+    subsidiary_id = getattr(user, 'subsidiary_id', None)
+    if not user.is_active:
+        return UserScope(user.pk, frozenset(), subsidiary_id, False)
+
+    # Consulta directa: ModelBackend memoriza en el propio objeto y podría arrastrar un permiso revertido.
+    # Como en ModelBackend, el superusuario tiene todos los permisos.
+    permissions = Permission.objects.all()
+    if not user.is_superuser:
+        permissions = permissions.filter(Q(user_permissions=user) | Q(group__user_groups=user))
+    rows = permissions.values_list('content_type__app_label', 'codename').distinct()
+    permissions = frozenset(f"{app_label}.{codename}" for app_label, codename in rows)
+
+    all_subsidiaries = user.is_superuser or (
+        subsidiary_id is not None and Subsidiary.objects.filter(pk=subsidiary_id, is_main=True).exists()
+    )
+    return UserScope(user.pk, permissions, subsidiary_id, all_subsidiaries)
+
+
+def get_user_scope(user):
+    """Alcance del usuario; se memoriza en el propio objeto durante la petición."""
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS_SCOPE
+    if in_transaction():
+        return resolve_user_scope(user)
+    scope = getattr(user, '_gamecenter_scope', None)
+    if scope is not None:
+        return scope
+
+    key = _cache_key(user.pk)
+    now = time.monotonic()
+    expires, scope = _local.get(key, (0, None))
+    if expires <= now:
+        timeout = get_timeout()
+        scope = cache.get(key)
+        if scope is None:
+            scope = resolve_user_scope(user)
+            cache.set(key, scope, timeout)
+        if len(_local) >= _LOCAL_LIMIT:
+            _local.clear()
+        _local[key] = (now + timeout, scope)
+
+    user._gamecenter_scope = scope
+    return scope
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend que responde `has_perm` desde el alcance en caché."""
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return frozenset()
+        return get_user_scope(user_obj).permissions
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+from gamecenter import throttling
+
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Las invalidaciones por versión de `cache_version` no llegan a otros procesos con una caché local."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    message = f"La caché 'default' ({backend}) es local al proceso; los cambios de permisos, descuentos y mantenimientos no se propagan a otros workers."
+    hint = "Configura CACHE_URL con una caché compartida (filecache://, redis://...)."
+    if settings.DEBUG:
+        return [Warning(message, hint=hint, id='gamecenter.W001')]
+    return [Error(message, hint=hint, id='gamecenter.E001')]
+
+
+THROTTLE_CLASS = 'gamecenter.throttling.SubsidiaryTokenBucketThrottle'
+PROCESS_LOCAL_THROTTLE_STORES = {'gamecenter.throttling.LocalTokenBucketStore'}
+
+
+@register()
+def check_throttle_store(app_configs, **kwargs):
+    """
+    El almacén de Redis necesita el paquete `redis`; sin él cada petición
+    fallaría. Con buckets locales al proceso cada worker aplica su propio límite.
+    """
+    if THROTTLE_CLASS not in getattr(settings, 'REST_FRAMEWORK', {}).get('DEFAULT_THROTTLE_CLASSES', []):
+        return []
+    backend = throttling.get_backend()
+    if backend == 'gamecenter.throttling.RedisTokenBucketStore' and throttling.redis is None:
+        return [Error(
+            f"El throttle usa {backend} pero el paquete `redis` no está instalado.",
+            hint="Instala las dependencias de requirements.txt.",
+            id='gamecenter.E003',
+        )]
+    if backend not in PROCESS_LOCAL_THROTTLE_STORES:
+        return []
+    message = f"El throttle usa {backend}, local al proceso; con varios workers el límite real se multiplica."
+    hint = "Usa gamecenter.throttling.RedisTokenBucketStore (THROTTLE_REDIS_URL)."
+    if settings.DEBUG:
+        return [Warning(message, hint=hint, id='gamecenter.W002')]
+    return [Error(message, hint=hint, id='gamecenter.E002')]
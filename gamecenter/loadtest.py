@@ -0,0 +1,278 @@
+"""
+Generador de carga HTTP con asyncio.
+
+Cada usuario virtual mantiene una conexión HTTP/1.1 keep-alive y elige en
+cada petición un escenario según su peso. Los escenarios son plantillas de
+ruta con marcadores (`{person}`, `{subsidiary}`...) que se completan con ids
+reales tomados de la base de datos al empezar. El resultado es un informe
+JSON con rendimiento, percentiles de latencia y tasa de errores, global y
+por escenario.
+
+Los escenarios `scoped` apuntan a vistas limitadas por sede: sin
+credenciales responden 404 o una lista vacía, así que `runnable_scenarios`
+los descarta en las corridas anónimas, igual que a los que usan un marcador
+sin ids visibles.
+"""
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import string
+import time
+from collections import Counter, namedtuple
+from urllib.parse import urlsplit
+
+Scenario = namedtuple('Scenario', ['name', 'method', 'path', 'weight', 'body', 'scoped'], defaults=[False])
+
+# Mezclas sobre los endpoints de `gamecenter/router.py`.
+MIXES = {
+    'frontdesk': [
+        Scenario('customer_lookup', 'GET', 'person/{person}/', 50, None),
+        Scenario('customer_create', 'POST', 'person/', 10, {
+            'first_name': 'Carga', 'last_name': '{unique}', 'email': 'carga{unique}@example.com',
+        }),
+        Scenario('console_list', 'GET', 'consoletype/', 25, None),
+        Scenario('subsidiary_detail', 'GET', 'subsidiary/{subsidiary}/', 10, None, scoped=True),
+        Scenario('cash_box_detail', 'GET', 'openingsalesbox/{openingsalesbox}/', 5, None),
+    ],
+    'kiosk': [
+        Scenario('console_list', 'GET', 'consoletype/', 80, None),
+        Scenario('customer_lookup', 'GET', 'person/{person}/', 20, None),
+    ],
+    'backoffice': [
+        Scenario('subsidiary_list', 'GET', 'subsidiary/', 30, None, scoped=True),
+        Scenario('user_detail', 'GET', 'user/{user}/', 30, None, scoped=True),
+        Scenario('local_settings_list', 'GET', 'localsettings/', 20, None),
+        Scenario('customer_lookup', 'GET', 'person/{person}/', 20, None),
+    ],
+}
+
+
+def load_mix(path):
+    """Lee una mezcla desde JSON: [{"name", "method", "path", "weight", "body"?, "scoped"?}, ...]"""
+    with open(path, encoding='utf-8') as source:
+        entries = json.load(source)
+    return [
+        Scenario(
+            entry['name'], entry.get('method', 'GET').upper(), entry['path'], entry.get('weight', 1),
+            entry.get('body'), entry.get('scoped', False),
+        )
+        for entry in entries
+    ]
+
+
+def placeholders(value):
+    """Marcadores `{nombre}` de una ruta o cuerpo."""
+    if isinstance(value, str):
+        return {name for _, name, _, _ in string.Formatter().parse(value) if name}
+    if isinstance(value, dict):
+        return set().union(*map(placeholders, value.values()))
+    if isinstance(value, list):
+        return set().union(*map(placeholders, value))
+    return set()
+
+
+def runnable_scenarios(scenarios, id_pools, authenticated):
+    """Separa los escenarios en (ejecutables, descartados con su motivo)."""
+    available = {'unique'} | {name for name, pool in id_pools.items() if pool}
+    runnable, skipped = [], {}
+    for scenario in scenarios:
+        missing = sorted((placeholders(scenario.path) | placeholders(scenario.body)) - available)
+        if scenario.scoped and not authenticated:
+            skipped[scenario.name] = "necesita credenciales"
+        elif missing:
+            skipped[scenario.name] = f"sin ids visibles para {', '.join(missing)}"
+        else:
+            runnable.append(scenario)
+    return runnable, skipped
+
+
+def percentile(ordered, fraction):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered), math.ceil(fraction * len(ordered))) - 1)
+    return ordered[index]
+
+
+def summarize(latencies, statuses, errors, elapsed):
+    ordered = sorted(latencies)
+    total = len(latencies) + errors
+    failed = errors + sum(count for status, count in statuses.items() if status >= 400)
+    milliseconds = lambda value: None if value is None else round(value * 1000, 3)
+    return {
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 2) if elapsed else None,
+        'error_rate': round(failed / total, 4) if total else 0.0,
+        'connection_errors': errors,
+        'status_codes': {str(status): count for status, count in sorted(statuses.items())},
+        'latency_ms': {
+            'mean': milliseconds(sum(ordered) / len(ordered)) if ordered else None,
+            'p50': milliseconds(percentile(ordered, 0.50)),
+            'p90': milliseconds(percentile(ordered, 0.90)),
+            'p95': milliseconds(percentile(ordered, 0.95)),
+            'p99': milliseconds(percentile(ordered, 0.99)),
+            'max': milliseconds(ordered[-1] if ordered else None),
+        },
+    }
+
+
+class _Fill(dict):
+    def __init__(self, pools, rng, unique):
+        super().__init__(unique=unique)
+        self.pools = pools
+        self.rng = rng
+
+    def __missing__(self, key):
+        pool = self.pools.get(key)
+        if not pool:
+            raise KeyError(f"No hay ids para '{{{key}}}'")
+        return self.rng.choice(pool)
+
+
+def _fill_body(body, values):
+    if isinstance(body, str):
+        return body.format_map(values)
+    if isinstance(body, dict):
+        return {key: _fill_body(value, values) for key, value in body.items()}
+    if isinstance(body, list):
+        return [_fill_body(value, values) for value in body]
+    return body
+
+
+class LoadTest:
+    def __init__(self, base_url, scenarios, id_pools, concurrency=16, duration=30.0, warmup=2.0, timeout=10.0, seed=None,
+                 headers=()):
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http':
+            raise ValueError("Solo se admite http://")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/') + '/'
+        self.scenarios = scenarios
+        self.cum_weights = list(itertools.accumulate(scenario.weight for scenario in scenarios))
+        self.id_pools = id_pools
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.timeout = timeout
+        self.seed = seed
+        self.headers = list(headers)
+        self.latencies = {scenario.name: [] for scenario in scenarios}
+        self.statuses = {scenario.name: Counter() for scenario in scenarios}
+        self.errors = Counter()
+        self._unique = itertools.count()
+        self._run_id = f"{os.getpid()}{int(time.time())}"
+
+    def build_request(self, scenario, rng):
+        values = _Fill(self.id_pools, rng, f"{self._run_id}{next(self._unique)}")
+        path = self.prefix + scenario.path.format_map(values)
+        headers = [
+            f"{scenario.method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+            "Connection: keep-alive",
+            *self.headers,
+        ]
+        payload = b""
+        if scenario.body is not None:
+            payload = json.dumps(_fill_body(scenario.body, values)).encode()
+            headers.append("Content-Type: application/json")
+        headers.append(f"Content-Length: {len(payload)}")
+        return ("\r\n".join(headers) + "\r\n\r\n").encode() + payload
+
+    async def read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("El servidor cerró la conexión")
+        status = int(status_line.split()[1])
+        length, chunked, close = None, False, False
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'transfer-encoding' and 'chunked' in value:
+                chunked = True
+            elif name == 'connection' and value == 'close':
+                close = True
+
+        if chunked:
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length is not None:
+            await reader.readexactly(length)
+        else:
+            await reader.read()
+            close = True
+        return status, close
+
+    async def user(self, index, measure_from, deadline):
+        rng = random.Random(None if self.seed is None else f"{self.seed}:{index}")
+        reader = writer = None
+        loop = asyncio.get_running_loop()
+        while loop.time() < deadline:
+            scenario = rng.choices(self.scenarios, cum_weights=self.cum_weights)[0]
+            request = self.build_request(scenario, rng)
+            started = time.perf_counter()
+            measured = loop.time() >= measure_from
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+                writer.write(request)
+                await writer.drain()
+                status, close = await asyncio.wait_for(self.read_response(reader), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError):
+                if measured:
+                    self.errors[scenario.name] += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+
+            if measured:
+                self.latencies[scenario.name].append(time.perf_counter() - started)
+                self.statuses[scenario.name][status] += 1
+            if close:
+                writer.close()
+                reader = writer = None
+
+        if writer is not None:
+            writer.close()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        measure_from = loop.time() + self.warmup
+        deadline = measure_from + self.duration
+        await asyncio.gather(*(self.user(index, measure_from, deadline) for index in range(self.concurrency)))
+        return self.report()
+
+    def report(self):
+        all_latencies = [value for values in self.latencies.values() for value in values]
+        all_statuses = sum(self.statuses.values(), Counter())
+        total_errors = sum(self.errors[scenario.name] for scenario in self.scenarios)
+        return {
+            'target': f"http://{self.host}:{self.port}{self.prefix}",
+            'concurrency': self.concurrency,
+            'duration_s': self.duration,
+            'warmup_s': self.warmup,
+            **summarize(all_latencies, all_statuses, total_errors, self.duration),
+            'scenarios': {
+                scenario.name: {
+                    'method': scenario.method,
+                    'path': scenario.path,
+                    'weight': scenario.weight,
+                    **summarize(self.latencies[scenario.name], self.statuses[scenario.name],
+                                self.errors[scenario.name], self.duration),
+                }
+                for scenario in self.scenarios
+            },
+        }
@@ -0,0 +1,85 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework import viewsets
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from gamecenter.models import OpeningSalesBox, Person
+from gamecenter.views import OpeningSalesBoxViewSet, PersonViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el list estándar de DRF con FastListMixin sobre N filas. "
+        "Los datos se crean dentro de una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+
+        with transaction.atomic():
+            self.populate(rows)
+            for viewset in (PersonViewSet, OpeningSalesBoxViewSet):
+                self.compare(viewset, repeat)
+            transaction.set_rollback(True)
+
+    def populate(self, rows):
+        persons = Person.objects.bulk_create([
+            Person(
+                first_name=f"Nombre {i} ñandú" if i % 7 else None,
+                last_name=f"Apellido {i}",
+                email=f"bench{i}@example.com" if i % 3 else None,
+                dni=str(10000000 + i),
+                phone=f"+51 9{i:08d}" if i % 5 else None,
+            )
+            for i in range(rows)
+        ], batch_size=5000)
+        OpeningSalesBox.objects.bulk_create([
+            OpeningSalesBox(
+                user=persons[i % len(persons)],
+                opening_amount=Decimal(i % 1000) + Decimal('0.50'),
+                closing_amount=Decimal(i % 777),
+            )
+            for i in range(rows)
+        ], batch_size=5000)
+
+    def compare(self, viewset, repeat):
+        baseline = type(f"Baseline{viewset.__name__}", (viewsets.ModelViewSet,), {
+            'queryset': viewset.queryset,
+            'serializer_class': viewset.serializer_class,
+            'renderer_classes': [JSONRenderer],
+        })
+
+        baseline_time, baseline_content = self.measure(baseline, repeat)
+        fast_time, fast_content = self.measure(viewset, repeat)
+
+        if baseline_content != fast_content:
+            raise CommandError(f"{viewset.__name__}: la ruta rápida no produce la misma salida")
+
+        self.stdout.write(
+            f"{viewset.__name__}: {len(fast_content)} bytes | "
+            f"DRF {baseline_time * 1000:.1f} ms | rápido {fast_time * 1000:.1f} ms | "
+            f"x{baseline_time / fast_time:.1f}"
+        )
+
+    def measure(self, viewset, repeat):
+        view = viewset.as_view({'get': 'list'})
+        factory = APIRequestFactory()
+        best, content = None, None
+        for _ in range(repeat):
+            request = factory.get('/', HTTP_ACCEPT='application/json')
+            start = time.perf_counter()
+            response = view(request)
+            response.render()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            content = response.content
+        return best, content
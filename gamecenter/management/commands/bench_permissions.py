@@ -0,0 +1,78 @@
+import time
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from gamecenter.authorization import CachedModelBackend, get_user_scope
+from gamecenter.models import LocalSettings, Subsidiary, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide comprobaciones de permisos por segundo con ModelBackend y con "
+        "CachedModelBackend, simulando peticiones (usuario recién cargado en cada una). "
+        "Los datos se confirman (dentro de una transacción la caché no se usa) y se borran al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--checks', type=int, default=5, help="Permisos comprobados por petición.")
+
+    def handle(self, *args, **options):
+        requests = options['requests']
+        checks = options['checks']
+
+        user = self.populate()
+        try:
+            perms = [
+                f"{app_label}.{codename}"
+                for app_label, codename in Permission.objects.filter(content_type__app_label='gamecenter')
+                .values_list('content_type__app_label', 'codename')[:checks]
+            ]
+
+            self.measure(ModelBackend(), lambda request_user: request_user.subsidiary, user, perms, requests)
+            self.measure(CachedModelBackend(), lambda request_user: get_user_scope(request_user).subsidiary_id,
+                         user, perms, requests)
+        finally:
+            self.cleanup(user)
+
+    @transaction.atomic
+    def populate(self):
+        local_setting = LocalSettings.objects.create()
+        subsidiary = Subsidiary.objects.create(name="Sede benchmark", local_setting=local_setting)
+        user = User.objects.create_user(username="bench-permissions", password="bench-permissions", subsidiary=subsidiary)
+        permissions = list(Permission.objects.filter(content_type__app_label='gamecenter'))
+        group = Group.objects.create(name="bench-permissions")
+        group.permissions.set(permissions[::2])
+        user.groups.add(group)
+        user.user_permissions.set(permissions[1::2])
+        return user
+
+    def cleanup(self, user):
+        subsidiary, local_setting = user.subsidiary, user.subsidiary.local_setting
+        Group.objects.filter(name="bench-permissions").delete()
+        user.delete()
+        subsidiary.delete()
+        local_setting.delete()
+
+    def measure(self, backend, resolve_subsidiary, user, perms, requests):
+        get_user_scope(User.objects.get(pk=user.pk))  # calienta la caché compartida
+        values = {field.attname: getattr(user, field.attname) for field in User._meta.concrete_fields}
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(requests):
+                request_user = User(**values)
+                for perm in perms:
+                    backend.has_perm(request_user, perm)
+                resolve_subsidiary(request_user)
+            elapsed = time.perf_counter() - start
+
+        total = requests * len(perms)
+        self.stdout.write(
+            f"{type(backend).__name__}: {total / elapsed:,.0f} comprobaciones/s | "
+            f"{len(queries.captured_queries) / requests:.2f} consultas por petición"
+        )
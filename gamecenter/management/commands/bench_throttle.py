@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from gamecenter import throttling
+from gamecenter.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide SubsidiaryTokenBucketThrottle.allow_request por segundo con el almacén local, "
+        "con Redis en --url y con un Redis que no responde (el throttle lo salta tras el primer error). "
+        "Las claves quedan en Redis hasta que vencen (unos segundos)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--clients', type=int, default=100, help="Usuarios distintos (un bucket cada uno).")
+        parser.add_argument('--url', default=throttling.get_config().get('OPTIONS', {}).get('url', 'redis://localhost:6379/0'))
+        parser.add_argument('--down-url', default='redis://192.0.2.1:6379/0',
+                            help="Dirección sin Redis para medir el caso caído.")
+
+    def handle(self, *args, **options):
+        stores = [
+            ('local', {'BACKEND': 'gamecenter.throttling.LocalTokenBucketStore', 'OPTIONS': {}}),
+            ('redis', {'BACKEND': 'gamecenter.throttling.RedisTokenBucketStore', 'OPTIONS': {'url': options['url']}}),
+            ('redis caído', {
+                'BACKEND': 'gamecenter.throttling.RedisTokenBucketStore', 'OPTIONS': {'url': options['down_url']},
+            }),
+        ]
+        if throttling.redis is None:
+            raise CommandError("Este benchmark necesita el paquete `redis`.")
+        # El script real, no un PING: el almacén deja pasar todo si Redis falla y se mediría el caso caído.
+        store = throttling.RedisTokenBucketStore(url=options['url'], socket_timeout=1, socket_connect_timeout=1)
+        try:
+            store.script(keys=[store.prefix + 'bench'], args=[1, 1])
+        except throttling.redis.RedisError as exc:
+            raise CommandError(f"Redis en {options['url']} no ejecuta el script del throttle: {exc}")
+
+        rates = throttling.get_config().get('RATES', throttling.DEFAULT_RATES)
+        requests = self.build_requests(options['clients'])
+        for name, config in stores:
+            with override_settings(GAMECENTER_THROTTLE={**config, 'RATES': rates}):
+                self.measure(name, requests, options['requests'])
+
+    def build_requests(self, clients):
+        factory = APIRequestFactory()
+        requests = []
+        for index in range(clients):
+            request = factory.get('/')
+            request.user = User(pk=index + 1, subsidiary_id=index % 3 + 1)
+            requests.append(request)
+        return requests
+
+    def measure(self, name, requests, total):
+        throttle, view = throttling.SubsidiaryTokenBucketThrottle(), object()
+        throttle.allow_request(requests[0], view)  # carga el script y abre la conexión
+
+        allowed = 0
+        start = time.perf_counter()
+        for index in range(total):
+            allowed += throttle.allow_request(requests[index % len(requests)], view)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{name}: {total / elapsed:,.0f} peticiones/s | {elapsed / total * 1e6:.1f} µs por petición | "
+            f"{allowed / total:.0%} permitidas"
+        )
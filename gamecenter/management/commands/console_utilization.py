@@ -0,0 +1,43 @@
+import datetime
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from gamecenter.actions import analytics
+
+
+class Command(BaseCommand):
+    help = (
+        "Utilización horaria de consolas por tipo y sede. Ejecutado cada noche "
+        "para el día anterior deja la caché lista para los reportes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=datetime.date.fromisoformat, help="Primer día (AAAA-MM-DD). Por defecto, ayer.")
+        parser.add_argument('--end', type=datetime.date.fromisoformat, help="Último día (AAAA-MM-DD). Por defecto, igual a --start.")
+        parser.add_argument('--console-type', type=int)
+        parser.add_argument('--subsidiary', type=int)
+        parser.add_argument('--chunk-size', type=int, default=analytics.CHUNK_SIZE)
+        parser.add_argument('--quiet', action='store_true', help="Solo calcula y guarda en caché, sin imprimir filas.")
+
+    def handle(self, *args, **options):
+        start = options['start'] or timezone.localdate() - datetime.timedelta(days=1)
+        end = options['end'] or start
+        if end < start:
+            raise CommandError("--end no puede ser anterior a --start")
+
+        began = time.perf_counter()
+        rows = analytics.hourly_utilization(
+            start, end,
+            console_type_id=options['console_type'],
+            subsidiary_id=options['subsidiary'],
+            chunk_size=options['chunk_size'],
+        )
+        elapsed = time.perf_counter() - began
+
+        if not options['quiet']:
+            self.stdout.write(json.dumps(rows, cls=DjangoJSONEncoder))
+        self.stderr.write(f"{len(rows)} filas de {start} a {end} en {elapsed:.2f} s")
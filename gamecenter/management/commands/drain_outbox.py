@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from gamecenter.actions import outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Publica los eventos pendientes de la bandeja de salida en lotes. "
+        "Con --loop queda corriendo como worker; se pueden lanzar varios a la vez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=outbox.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=outbox.DEFAULT_MAX_ATTEMPTS)
+        parser.add_argument('--sink', help="Ruta de la clase destino; por defecto GAMECENTER_OUTBOX_SINK.")
+        parser.add_argument('--loop', action='store_true', help="No terminar al vaciar la bandeja.")
+        parser.add_argument('--interval', type=float, default=1.0, help="Segundos de espera con la bandeja vacía.")
+        parser.add_argument(
+            '--retry-parked', action='store_true',
+            help="Antes de drenar, reactivar los eventos que agotaron --max-attempts.",
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_parked']:
+            self.stdout.write(f"Reactivados: {outbox.retry_parked(options['max_attempts'])}")
+        sink = outbox.get_sink(options['sink'])
+        try:
+            while True:
+                delivered, failed = outbox.drain(sink, options['batch_size'], options['max_attempts'])
+                if delivered or failed:
+                    self.stdout.write(f"Entregados: {delivered} | Fallidos: {failed}")
+                if not options['loop']:
+                    break
+                if not delivered:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sink.close()
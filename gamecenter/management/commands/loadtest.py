@@ -0,0 +1,187 @@
+import asyncio
+import base64
+import importlib.util
+import json
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import time
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, authenticate
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.crypto import get_random_string
+
+from gamecenter import loadtest
+from gamecenter.models import ConsoleType, OpeningSalesBox, Person, Subsidiary, User
+from gamecenter.views.SubsidiaryScopedMixin import scope_queryset
+
+POOL_SIZE = 10000
+
+
+def id_pools(user=None):
+    """Ids reales para completar las rutas de los escenarios, limitados a los que `user` puede ver."""
+    user = user or AnonymousUser()
+    querysets = {
+        'person': Person.objects.all(),
+        'subsidiary': scope_queryset(Subsidiary.objects.all(), user, 'pk'),
+        'user': scope_queryset(User.objects.all(), user),
+        'openingsalesbox': OpeningSalesBox.objects.all(),
+        'consoletype': ConsoleType.objects.all(),
+    }
+    return {
+        name: list(queryset.order_by('?').values_list('pk', flat=True)[:POOL_SIZE])
+        for name, queryset in querysets.items()
+    }
+
+
+def open_session(user):
+    """Sesión ya iniciada para `user`, como la que deja el login; devuelve (sesión, cabeceras)."""
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = user.backend
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    # SessionAuthentication exige CSRF en los POST: el mismo secreto en la cookie y en la cabecera.
+    csrf_secret = get_random_string(32)
+    csrf_header = settings.CSRF_HEADER_NAME.removeprefix('HTTP_').replace('_', '-')
+    return session, [
+        f"Cookie: {settings.SESSION_COOKIE_NAME}={session.session_key}; {settings.CSRF_COOKIE_NAME}={csrf_secret}",
+        f"{csrf_header}: {csrf_secret}",
+    ]
+
+
+def server_command(kind, host, port):
+    if kind == 'wsgi':
+        return [sys.executable, str(settings.BASE_DIR / 'manage.py'), 'runserver', '--noreload', f"{host}:{port}"]
+    if importlib.util.find_spec('uvicorn') is None:
+        raise CommandError("--server asgi necesita uvicorn instalado; usa --server-cmd para otro servidor ASGI.")
+    return [sys.executable, '-m', 'uvicorn', 'gamecenter_service.asgi:application',
+            '--host', host, '--port', str(port), '--log-level', 'warning', '--no-access-log']
+
+
+def wait_for_port(host, port, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"El servidor terminó con código {process.returncode} antes de aceptar conexiones.")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"El servidor no respondió en {host}:{port} tras {timeout}s.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga HTTP con usuarios virtuales asyncio y una mezcla ponderada de escenarios. "
+        "Imprime un informe JSON con rendimiento, percentiles de latencia y tasa de errores."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8765/gamecenter/', help="URL base de la API.")
+        parser.add_argument('--mix', default='frontdesk',
+                            help=f"Mezcla incluida ({', '.join(loadtest.MIXES)}) o ruta a un JSON de escenarios.")
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--duration', type=float, default=30.0, help="Segundos medidos.")
+        parser.add_argument('--warmup', type=float, default=2.0, help="Segundos iniciales que no se miden.")
+        parser.add_argument('--timeout', type=float, default=10.0, help="Timeout por petición en segundos.")
+        parser.add_argument('--seed', type=int)
+        parser.add_argument('--username', help="Usuario con el que se autentican las peticiones y se eligen los ids.")
+        parser.add_argument('--password', default=os.environ.get('LOADTEST_PASSWORD'),
+                            help="Contraseña de --username; por defecto LOADTEST_PASSWORD.")
+        parser.add_argument('--auth', choices=['session', 'basic'], default='session',
+                            help="Cómo autenticar a --username: una sesión abierta al empezar o Basic, que "
+                                 "vuelve a verificar la contraseña (y su hash) en cada petición.")
+        parser.add_argument('--header', action='append', default=[], metavar='"NOMBRE: VALOR"',
+                            help="Cabecera extra en cada petición (p. ej. otra autenticación); se puede repetir.")
+        parser.add_argument('--server', choices=['wsgi', 'asgi'],
+                            help="Levanta un servidor local en el puerto de --url durante la prueba.")
+        parser.add_argument('--server-cmd', help="Comando propio para levantar el servidor (p. ej. gunicorn).")
+        parser.add_argument('--throttle', action='store_true',
+                            help="Deja activo el throttle en el servidor levantado; por defecto se apaga "
+                                 "para medir la API y no el límite de peticiones.")
+        parser.add_argument('--output', help="Archivo donde escribir el informe; por defecto la salida estándar.")
+
+    def handle(self, *args, **options):
+        mix = options['mix']
+        headers = list(options['header'])
+        if any(':' not in header for header in headers):
+            raise CommandError('--header debe tener la forma "Nombre: valor".')
+        user = self.resolve_user(options['username'], options['password'], headers)
+        pools = id_pools(user)
+        scenarios, skipped = loadtest.runnable_scenarios(
+            loadtest.MIXES.get(mix) or loadtest.load_mix(mix), pools, authenticated=user is not None or bool(headers),
+        )
+        for name, reason in skipped.items():
+            self.stderr.write(f"Escenario '{name}' descartado: {reason}.")
+        if not scenarios:
+            raise CommandError(f"Ningún escenario de '{mix}' se puede ejecutar.")
+
+        session = None
+        if user is not None and options['password'] is not None:
+            if options['auth'] == 'basic':
+                credentials = base64.b64encode(f"{options['username']}:{options['password']}".encode()).decode()
+                headers.append(f"Authorization: Basic {credentials}")
+            else:
+                session, session_headers = open_session(user)
+                headers.extend(session_headers)
+        parts = urlsplit(options['url'])
+        host, port = parts.hostname, parts.port or 80
+
+        process = None
+        command = shlex.split(options['server_cmd']) if options['server_cmd'] else (
+            server_command(options['server'], host, port) if options['server'] else None
+        )
+        if command:
+            env = {**os.environ, 'THROTTLE_ENABLED': 'true' if options['throttle'] else 'false'}
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+        try:
+            if process:
+                wait_for_port(host, port, process, timeout=30)
+            test = loadtest.LoadTest(
+                options['url'], scenarios, pools,
+                concurrency=options['concurrency'], duration=options['duration'],
+                warmup=options['warmup'], timeout=options['timeout'], seed=options['seed'], headers=headers,
+            )
+            report = asyncio.run(test.run())
+        finally:
+            if process:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            if session is not None:
+                session.delete()
+
+        report['mix'] = mix
+        report['user'] = options['username']
+        report['skipped_scenarios'] = skipped
+        report['server'] = ' '.join(command) if command else None
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as target:
+                target.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def resolve_user(self, username, password, headers):
+        """El usuario de --username; con --password se validan las credenciales antes de empezar."""
+        if not username:
+            return None
+        if password is None:
+            if not headers:
+                raise CommandError("--username necesita --password (o LOADTEST_PASSWORD) o una --header de autenticación.")
+            user = User.objects.filter(username=username).first()
+        else:
+            user = authenticate(username=username, password=password)
+        if user is None:
+            raise CommandError(f"No se pudo autenticar a '{username}'.")
+        return user
@@ -0,0 +1,40 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from gamecenter.actions import inventory
+
+
+class Command(BaseCommand):
+    help = (
+        "Guarda la foto diaria de stock por lote (por defecto, la de ayer). "
+        "Pensado para ejecutarse una vez al día desde cron, pasado GAMECENTER_SNAPSHOT_LAG "
+        "(15 minutos por defecto) desde la medianoche; antes la foto se rechaza."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=datetime.date.fromisoformat,
+                            help="Día a cerrar (AAAA-MM-DD). Por defecto, ayer.")
+        parser.add_argument('--bootstrap', action='store_true',
+                            help="Abre el libro para los lotes que aún no tienen movimientos.")
+        parser.add_argument('--reconcile', action='store_true',
+                            help="Compara current_stock con el libro y corrige las diferencias.")
+
+    def handle(self, *args, **options):
+        if options['bootstrap']:
+            opened = inventory.bootstrap()
+            self.stdout.write(f"Saldos iniciales registrados: {len(opened)}")
+
+        day = options['date'] or timezone.localdate() - datetime.timedelta(days=1)
+        try:
+            count = inventory.take_snapshot(day)
+        except ValueError as error:
+            raise CommandError(str(error))
+        self.stdout.write(f"Foto de stock al {day}: {count} lotes")
+
+        if options['reconcile']:
+            mismatches = inventory.reconcile(fix=True)
+            for lot_id, (cached, expected) in sorted(mismatches.items()):
+                self.stdout.write(f"Lote {lot_id}: current_stock {cached} -> {expected}")
+            self.stdout.write(f"Lotes corregidos: {len(mismatches)}")
@@ -0,0 +1,36 @@
+import datetime
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from gamecenter.actions import expiration
+
+
+class Command(BaseCommand):
+    help = (
+        "Retira los lotes comestibles vencidos (pasan a no disponibles y su stock se da de baja "
+        "en el libro) y muestra los que vencen en los próximos días por sede. Pensado para cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=datetime.date.fromisoformat,
+                            help="Fecha de referencia (AAAA-MM-DD). Por defecto, hoy.")
+        parser.add_argument('--batch-size', type=int, default=expiration.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--days', type=int, default=7, help="Ventana del informe de próximos vencimientos.")
+        parser.add_argument('--subsidiary', type=int, help="Limita el informe a una sede.")
+        parser.add_argument('--report-only', action='store_true', help="No retira lotes; solo muestra el informe.")
+
+    def handle(self, *args, **options):
+        today = options['date'] or timezone.localdate()
+
+        if options['report_only']:
+            pending = expiration.expired_lots(today).count()
+            self.stdout.write(f"Lotes vencidos pendientes de retirar: {pending}")
+        else:
+            retired, units = expiration.sweep(today, options['batch_size'])
+            self.stdout.write(f"Lotes retirados: {retired} | Unidades dadas de baja: {units}")
+
+        report = expiration.expiring_report(options['days'], today, options['subsidiary'])
+        self.stdout.write(json.dumps(report, cls=DjangoJSONEncoder, indent=2, ensure_ascii=False))
@@ -0,0 +1,385 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:31
+
+import django.contrib.auth.models
+import django.contrib.auth.validators
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('group', models.CharField(blank=True, choices=[('comestibles', 'Comestibles'), ('dispositivos', 'Dispositivos'), ('accesorios', 'Accesorios')], max_length=50, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Categories',
+            },
+        ),
+        migrations.CreateModel(
+            name='ConsoleType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Game',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(blank=True, max_length=255, null=True)),
+                ('gender', models.CharField(choices=[('action', 'Acción'), ('adventure', 'Aventura'), ('rpg', 'RPG'), ('shooter', 'Shooter'), ('sports', 'Deportes'), ('strategy', 'Estrategia'), ('simulation', 'Simulación'), ('puzzle', 'Puzzle'), ('horror', 'Horror'), ('other', 'Otro')], max_length=50)),
+                ('release_year', models.PositiveIntegerField()),
+                ('description', models.TextField(blank=True)),
+                ('game_material_type', models.CharField(choices=[('digital', 'Digital'), ('fisico', 'Físico')], max_length=50)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LocalSettings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('currency', models.CharField(choices=[('PEN', 'PEN'), ('USD', 'USD'), ('EUR', 'EUR'), ('BRL', 'BRL')], default='PEN', max_length=10)),
+                ('minimum_time_sessions', models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Lots',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lot_number', models.CharField(blank=True, max_length=100, null=True)),
+                ('manufacturing_date', models.DateField(blank=True, null=True)),
+                ('expiration_date', models.DateField(blank=True, null=True)),
+                ('initial_stock', models.PositiveIntegerField(blank=True, null=True)),
+                ('current_stock', models.PositiveIntegerField(blank=True, default=0, null=True)),
+                ('state', models.CharField(choices=[('available', 'Disponible'), ('unavailable', 'No disponible')], max_length=50)),
+                ('entry_date', models.DateField(blank=True, null=True)),
+                ('observations', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MembershipType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('first_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('last_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True, unique=True)),
+                ('dni', models.CharField(blank=True, max_length=20, null=True)),
+                ('phone', models.CharField(blank=True, max_length=25, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Price',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('unit_measurement', models.CharField(choices=[('unidad', 'Unidad'), ('min', 'Minutos'), ('hora', 'Hora')], max_length=100)),
+                ('sale_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('purchase_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ConsoleMaintenance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('maintenance_date', models.DateField(auto_now_add=True)),
+                ('maintenance_reason', models.CharField(choices=[('reparación', 'Reparación'), ('limpieza', 'Limpieza'), ('actualización', 'Actualización'), ('sobrecalentamiento', 'Sobrecalentamiento'), ('problemas de hardware', 'Problemas de hardware'), ('problemas de software', 'Problemas de software'), ('otro', 'Otro')], max_length=255)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('description', models.TextField(blank=True)),
+                ('responsible', models.CharField(blank=True, max_length=255, null=True)),
+                ('observations', models.TextField(blank=True, null=True)),
+                ('console', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_console', to='gamecenter.consoletype')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OpeningSalesBox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('opening_date', models.DateField(auto_now_add=True)),
+                ('opening_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('closing_date', models.DateField(blank=True, null=True)),
+                ('closing_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date', models.DateField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='opening_sales_box', to='gamecenter.person')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ConsoleReservations',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reservation_date', models.DateField(auto_now_add=True)),
+                ('hour_count', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('start_hour', models.DateTimeField(blank=True, null=True)),
+                ('end_hour', models.DateTimeField(blank=True, null=True)),
+                ('accessory_count', models.PositiveIntegerField(default=2)),
+                ('state', models.CharField(choices=[('reservado', 'Reservado'), ('cancelado', 'Cancelado'), ('completado', 'Completado')], default='reservado', max_length=50)),
+                ('advance_payment', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('lots', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='consolereservations_lots', to='gamecenter.lots')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='consolereservations_client', to='gamecenter.person')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PersonMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('membership_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='personmembership_membershiptype', to='gamecenter.membershiptype')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='personmembership_person', to='gamecenter.person')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='lots',
+            name='price',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='lots_price', to='gamecenter.price'),
+        ),
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('image', models.URLField(blank=True, null=True)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='product_category', to='gamecenter.category')),
+                ('console_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='product_console_type', to='gamecenter.consoletype')),
+            ],
+            options={
+                'unique_together': {('name', 'category')},
+            },
+        ),
+        migrations.AddField(
+            model_name='price',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='gamecenter.product'),
+        ),
+        migrations.AddField(
+            model_name='lots',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lots_product', to='gamecenter.product'),
+        ),
+        migrations.CreateModel(
+            name='Sale',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date_sale', models.DateField(auto_now_add=True)),
+                ('subtotal', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('igv', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('total', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('payment_method', models.CharField(blank=True, choices=[('efectivo', 'Efectivo'), ('tarjeta', 'Tarjeta'), ('transferencia', 'Transferencia')], max_length=50, null=True)),
+                ('state', models.CharField(choices=[('pendiente', 'Pendiente'), ('completado', 'Completado')], default='pendiente', max_length=50)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_client', to='gamecenter.person')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_user', to='gamecenter.person')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SaleBoxMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('movement_type', models.CharField(choices=[('entrada', 'Entrada'), ('salida', 'Salida')], max_length=50)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('movement_date', models.DateField(auto_now_add=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('opening_sales_box', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements_opening_sales_box', to='gamecenter.openingsalesbox')),
+                ('sale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements_sale', to='gamecenter.sale')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SaleDetail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('amount', models.PositiveIntegerField()),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('discount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('subtotal', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('lot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sale_details_lot', to='gamecenter.lots')),
+                ('sale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sale_details', to='gamecenter.sale')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Session',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('hour_count', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('session_date', models.DateField(auto_now_add=True)),
+                ('start_time', models.DateTimeField(blank=True, null=True)),
+                ('end_time', models.DateTimeField(blank=True, null=True)),
+                ('total_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('accessory_amount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('state', models.CharField(choices=[('en curso', 'En curso'), ('finalizado', 'Finalizado')], default='en curso', max_length=50)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='client_sessions', to='gamecenter.person')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sales_session', to='gamecenter.session'),
+        ),
+        migrations.CreateModel(
+            name='SessionLots',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lots', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sessions_lots', to='gamecenter.lots')),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='lots', to='gamecenter.session')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Subsidiary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(blank=True, max_length=255, null=True)),
+                ('address', models.CharField(blank=True, max_length=255, null=True)),
+                ('contact_number', models.CharField(blank=True, max_length=25, null=True)),
+                ('date_opened', models.DateField(blank=True, null=True)),
+                ('is_main', models.BooleanField(default=False)),
+                ('local_setting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subsidiary_localsetting', to='gamecenter.localsettings')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('username', models.CharField(error_messages={'unique': 'A user with that username already exists.'}, help_text='Required. 150 characters or fewer. Letters, digits and @/./+/-/_ only.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='username')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='first name')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='last name')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='email address')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to.', related_name='user_groups', to='auth.group', verbose_name='groups')),
+                ('person', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='user_person', to='gamecenter.person')),
+                ('subsidiary', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='user_subsidiary', to='gamecenter.subsidiary')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_permissions', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'verbose_name': 'user',
+                'verbose_name_plural': 'users',
+                'abstract': False,
+            },
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConsoleTypeGame',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('console_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='console_games', to='gamecenter.consoletype')),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='console_types', to='gamecenter.game')),
+            ],
+            options={
+                'unique_together': {('console_type', 'game')},
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='lots',
+            unique_together={('product', 'lot_number')},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamecenter', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipDiscount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('percentage', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='membershipdiscount_category', to='gamecenter.category')),
+                ('membership_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='membershipdiscount_membershiptype', to='gamecenter.membershiptype')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='membershipdiscount_product', to='gamecenter.product')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
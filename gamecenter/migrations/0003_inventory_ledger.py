@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamecenter', '0002_membership_discount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('movement_type', models.CharField(choices=[('ingreso', 'Ingreso'), ('venta', 'Venta'), ('ajuste', 'Ajuste'), ('sesion', 'Uso en sesión')], max_length=50)),
+                ('quantity', models.IntegerField()),
+                ('observations', models.TextField(blank=True)),
+                ('lot', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='inventorymovement_lot', to='gamecenter.lots')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='inventorymovement_product', to='gamecenter.product')),
+                ('sale_detail', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='inventorymovement_saledetail', to='gamecenter.saledetail')),
+                ('session_lot', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='inventorymovement_sessionlot', to='gamecenter.sessionlots')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['lot', 'created_at'], name='gamecenter__lot_id_f56723_idx'), models.Index(fields=['product', 'created_at'], name='gamecenter__product_5c5beb_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('snapshot_date', models.DateField(db_index=True)),
+                ('stock', models.IntegerField()),
+                ('last_movement_id', models.BigIntegerField(default=0)),
+                ('lot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stocksnapshot_lot', to='gamecenter.lots')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stocksnapshot_product', to='gamecenter.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'snapshot_date'], name='gamecenter__product_8f5452_idx')],
+                'unique_together': {('lot', 'snapshot_date')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamecenter', '0003_inventory_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lots',
+            name='subsidiary',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='lots_subsidiary', to='gamecenter.subsidiary'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamecenter', '0004_lots_subsidiary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consolemaintenance',
+            name='lots',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_lots', to='gamecenter.lots'),
+        ),
+        migrations.AddIndex(
+            model_name='consolemaintenance',
+            index=models.Index(condition=models.Q(('end_date__isnull', True)), fields=['console', 'lots'], name='consolemaintenance_open_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamecenter', '0006_outbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lots',
+            index=models.Index(fields=['state', 'expiration_date'], name='lots_state_expiration_idx'),
+        ),
+    ]
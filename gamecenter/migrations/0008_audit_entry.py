@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:31
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamecenter', '0007_lots_expiration_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('object_id', models.CharField(max_length=100)),
+                ('action', models.CharField(choices=[('created', 'Creado'), ('updated', 'Modificado'), ('deleted', 'Eliminado')], max_length=10)),
+                ('changes', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('changed_at', models.DateTimeField()),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='auditentry_user', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Audit entries',
+                'indexes': [models.Index(fields=['model', 'object_id', 'changed_at'], name='auditentry_object_idx'), models.Index(fields=['changed_at'], name='auditentry_changed_at_idx')],
+            },
+        ),
+    ]
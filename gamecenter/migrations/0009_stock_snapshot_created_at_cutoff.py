@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamecenter', '0008_audit_entry'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='stocksnapshot',
+            name='last_movement_id',
+        ),
+        migrations.AddIndex(
+            model_name='inventorymovement',
+            index=models.Index(fields=['created_at'], name='gamecenter__created_b28937_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.models import AbstractUser, Group, Permission
+from django.utils import timezone
 
 class TimeStampedModel(models.Model):
     """Abstracto: agrega created_at / updated_at."""
@@ -11,6 +13,24 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+class OutboxModel(TimeStampedModel):
+    """
+    Abstracto: cada alta, cambio o baja deja un OutboxEvent en la misma
+    transacción. Los eventos los registran las señales `post_save` y
+    `post_delete` (ver `gamecenter.signals`), así que también cubren los
+    borrados en cascada y `QuerySet.delete()`. `QuerySet.update()`,
+    `bulk_create()` y `bulk_update()` no envían señales y no dejan eventos.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # `post_save` se envía fuera de la transacción de `save_base`; así queda dentro.
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+
 class Person(TimeStampedModel):
     first_name = models.CharField(max_length=255, null=True, blank=True)
     last_name = models.CharField(max_length=255, null=True, blank=True)
@@ -163,6 +183,25 @@ class Price(TimeStampedModel):
         return f"{self.product.name} - {self.sale_price} por {self.unit_measurement}"
     
 
+class MembershipDiscount(TimeStampedModel):
+    """Descuento por tipo de membresía: por producto, por categoría o general (ambos vacíos)."""
+    membership_type = models.ForeignKey(MembershipType, on_delete=models.CASCADE, related_name="membershipdiscount_membershiptype")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="membershipdiscount_category", null=True, blank=True)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="membershipdiscount_product", null=True, blank=True)
+    percentage = models.DecimalField(max_digits=5, decimal_places=2)
+    is_active = models.BooleanField(default=True, db_index=True)
+
+    def clean(self):
+        if self.category_id and self.product_id:
+            raise ValidationError("Un descuento aplica a una categoría o a un producto, no a ambos.")
+        if self.percentage is not None and not 0 <= self.percentage <= 100:
+            raise ValidationError("El porcentaje de descuento debe estar entre 0 y 100.")
+
+    def __str__(self):
+        target = self.product or self.category or "General"
+        return f"{self.membership_type.name} - {target}: {self.percentage}%"
+
+
 class Lots(TimeStampedModel):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="lots_product")
     lot_number = models.CharField(max_length=100, null=True, blank=True)
@@ -171,6 +210,7 @@ class Lots(TimeStampedModel):
     initial_stock = models.PositiveIntegerField(null=True, blank=True)
     current_stock = models.PositiveIntegerField(default=0, null=True, blank=True)
     price = models.ForeignKey(Price, on_delete=models.CASCADE, related_name="lots_price", null=True, blank=True)
+    subsidiary = models.ForeignKey(Subsidiary, on_delete=models.PROTECT, related_name="lots_subsidiary", null=True, blank=True)
     state = models.CharField(max_length=50, choices=[
         ("available", "Disponible"),
         ("unavailable", "No disponible"),
@@ -180,6 +220,10 @@ class Lots(TimeStampedModel):
 
     class Meta:
         unique_together = ("product", "lot_number")
+        indexes = [
+            # Barrido de vencimientos: lotes disponibles ordenados por fecha de vencimiento.
+            models.Index(fields=["state", "expiration_date"], name="lots_state_expiration_idx"),
+        ]
 
     def __str__(self):
         return f"Lot {self.lot_number} - {self.product.name}"
@@ -199,11 +243,18 @@ class ConsoleReservations(TimeStampedModel):
     ], default="reservado")
     advance_payment = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
+    def clean(self):
+        from gamecenter.actions.availability import ensure_available
+        if self.lots_id and self.state == "reservado":
+            # Se valida el día reservado, no el de hoy: un mantenimiento que empieza antes también la bloquea.
+            ensure_available(self.lots_id, today=timezone.localdate(self.start_hour) if self.start_hour else None)
+
     def __str__(self):
         return f"Reserva {self.id} - {self.client.name} - {self.lots.product.name}"
 
 class ConsoleMaintenance(TimeStampedModel):
     console = models.ForeignKey(ConsoleType, on_delete=models.CASCADE, related_name="maintenance_console")
+    lots = models.ForeignKey(Lots, on_delete=models.CASCADE, related_name="maintenance_lots", null=True, blank=True)  # Vacío: todo el tipo de consola
     maintenance_date = models.DateField(auto_now_add=True)
     maintenance_reason = models.CharField(max_length=255, choices=[
         ("reparación", "Reparación"),
@@ -220,8 +271,17 @@ class ConsoleMaintenance(TimeStampedModel):
     responsible = models.CharField(max_length=255, null=True, blank=True)
     observations = models.TextField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Solo los mantenimientos abiertos: es lo que consulta la disponibilidad.
+            models.Index(fields=["console", "lots"], condition=models.Q(end_date__isnull=True), name="consolemaintenance_open_idx"),
+        ]
+
+    def __str__(self):
+        return f"Mantenimiento {self.id} - {self.console.name}"
+
 
-class Session(TimeStampedModel):
+class Session(OutboxModel):
     client = models.ForeignKey(Person, on_delete=models.PROTECT, related_name="client_sessions")
     hour_count = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     session_date = models.DateField(auto_now_add=True)
@@ -367,6 +427,11 @@ class SessionLots(TimeStampedModel):
     session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='lots', null=True, blank=True)
     lots = models.ForeignKey(Lots, on_delete=models.CASCADE, related_name='sessions_lots', null=True, blank=True)
 
+    def clean(self):
+        from gamecenter.actions.availability import ensure_available
+        if self.lots_id:
+            ensure_available(self.lots_id)
+
     def __str__(self):
         return f"{self.session.id} - {self.lots.product.name} x{self.lots.quantity}"
 
@@ -382,7 +447,7 @@ class OpeningSalesBox(TimeStampedModel):
         return f"Apertura de Caja {self.id} - {self.user.username}"
 
 
-class Sale(TimeStampedModel):
+class Sale(OutboxModel):
     client = models.ForeignKey(Person, on_delete=models.CASCADE, related_name="sales_client")
     user = models.ForeignKey(Person, on_delete=models.CASCADE, related_name="sales_user")
     session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="sales_session", null=True, blank=True)
@@ -415,7 +480,7 @@ class SaleDetail(TimeStampedModel):
         return f"Detalle de Venta {self.id} - {self.sale.client.name}"
     
 
-class SaleBoxMovement(TimeStampedModel):
+class SaleBoxMovement(OutboxModel):
     opening_sales_box = models.ForeignKey(OpeningSalesBox, on_delete=models.CASCADE, related_name="movements_opening_sales_box")
     sale = models.ForeignKey(Sale, on_delete=models.CASCADE, related_name="movements_sale")
     movement_type = models.CharField(max_length=50, choices=[
@@ -428,3 +493,111 @@ class SaleBoxMovement(TimeStampedModel):
 
     def __str__(self):
         return f"Movimiento de Caja {self.id} - {self.opening_sales_box.sales_box.name}"
+
+
+class InventoryMovement(TimeStampedModel):
+    """Libro de inventario: solo se agregan filas. `quantity` es positiva en entradas y negativa en salidas."""
+    lot = models.ForeignKey(Lots, on_delete=models.PROTECT, related_name="inventorymovement_lot")
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name="inventorymovement_product")
+    movement_type = models.CharField(max_length=50, choices=[
+        ("ingreso", "Ingreso"),
+        ("venta", "Venta"),
+        ("ajuste", "Ajuste"),
+        ("sesion", "Uso en sesión"),
+    ])
+    quantity = models.IntegerField()
+    sale_detail = models.ForeignKey(SaleDetail, on_delete=models.SET_NULL, related_name="inventorymovement_saledetail", null=True, blank=True)
+    session_lot = models.ForeignKey(SessionLots, on_delete=models.SET_NULL, related_name="inventorymovement_sessionlot", null=True, blank=True)
+    observations = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["lot", "created_at"]),
+            models.Index(fields=["product", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_movement_type_display()} {self.quantity:+d} - Lote {self.lot_id}"
+
+
+class StockSnapshot(TimeStampedModel):
+    """Stock de un lote al cierre de `snapshot_date`: movimientos con `created_at` anterior a la medianoche siguiente."""
+    lot = models.ForeignKey(Lots, on_delete=models.CASCADE, related_name="stocksnapshot_lot")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="stocksnapshot_product")
+    snapshot_date = models.DateField(db_index=True)
+    stock = models.IntegerField()
+
+    class Meta:
+        unique_together = ("lot", "snapshot_date")
+        indexes = [
+            models.Index(fields=["product", "snapshot_date"]),
+        ]
+
+    def __str__(self):
+        return f"Lote {self.lot_id} al {self.snapshot_date}: {self.stock}"
+
+
+class OutboxEvent(TimeStampedModel):
+    """Eventos pendientes de publicar a otros sistemas (ver `manage.py drain_outbox`)."""
+    event_type = models.CharField(max_length=100)
+    aggregate_type = models.CharField(max_length=100)
+    aggregate_id = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    published_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)  # Vacío: se puede intentar ya
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], condition=models.Q(published_at__isnull=True), name="outboxevent_pending_idx"),
+            models.Index(fields=["aggregate_type", "aggregate_id"]),
+        ]
+
+    @classmethod
+    def record(cls, instance, action):
+        payload = {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+        return cls.objects.create(
+            event_type=f"{instance._meta.model_name}.{action}",
+            aggregate_type=instance._meta.model_name,
+            aggregate_id=str(instance.pk),
+            payload=payload,
+        )
+
+    def as_message(self):
+        return {
+            "id": self.id,
+            "event_type": self.event_type,
+            "aggregate_type": self.aggregate_type,
+            "aggregate_id": self.aggregate_id,
+            "payload": self.payload,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    def __str__(self):
+        return f"{self.event_type} {self.aggregate_id}"
+
+
+class AuditEntry(models.Model):
+    """Historial de cambios por campo (ver `gamecenter.audit`). Se escribe en lotes, nunca en el mismo save."""
+    model = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=100)
+    action = models.CharField(max_length=10, choices=[
+        ("created", "Creado"),
+        ("updated", "Modificado"),
+        ("deleted", "Eliminado"),
+    ])
+    changes = models.JSONField(encoder=DjangoJSONEncoder)  # {campo: [antes, después]}
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, related_name="auditentry_user", null=True, blank=True)
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Audit entries"
+        indexes = [
+            models.Index(fields=["model", "object_id", "changed_at"], name="auditentry_object_idx"),
+            models.Index(fields=["changed_at"], name="auditentry_changed_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} {self.action}"
@@ -0,0 +1,32 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el renderer estándar
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que serializa con orjson cuando está disponible.
+
+    La salida es idéntica a la de `JSONRenderer` con la configuración por
+    defecto (JSON compacto y UTF-8). Cualquier caso que orjson no cubra igual
+    (indentación, `ensure_ascii`, claves no string, enteros enormes...) se
+    delega al renderer original.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_UTC_Z)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Igual que JSONRenderer: \u2028 y \u2029 siempre escapados.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
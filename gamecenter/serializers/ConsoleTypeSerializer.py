@@ -0,0 +1,17 @@
+import rest_framework.serializers as serializers
+from gamecenter.actions.availability import unavailable_console_types
+from gamecenter.models import ConsoleType
+
+class ConsoleTypeSerializer(serializers.ModelSerializer):
+    is_available = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ConsoleType
+        fields = ['id', 'name', 'is_available']
+        read_only_fields = ['id', 'is_available']
+
+    def get_is_available(self, obj):
+        # El conjunto se calcula una vez por respuesta, no por consola
+        if 'unavailable_console_types' not in self.context:
+            self.context['unavailable_console_types'] = unavailable_console_types()
+        return obj.id not in self.context['unavailable_console_types']
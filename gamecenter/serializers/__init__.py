@@ -2,4 +2,5 @@ from .OpeningSalesBoxSerializer import OpeningSalesBoxSerializer
 from .PersonSerializer import PersonSerializer
 from .UserSerializer import UserSerializer
 from .LocalSettingsSerializer import LocalSettingsSerializer
-from .SubsidiarySerializer import SubsidiarySerializer
\ No newline at end of file
+from .SubsidiarySerializer import SubsidiarySerializer
+from .ConsoleTypeSerializer import ConsoleTypeSerializer
\ No newline at end of file
@@ -0,0 +1,170 @@
+from django.apps import apps
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from django.utils import timezone
+
+from gamecenter import audit, authorization
+from gamecenter.actions import analytics, availability, pricing
+from gamecenter.actions.cache_version import bump_version
+from gamecenter.models import (
+    Category, ConsoleMaintenance, Lots, MembershipDiscount, OutboxEvent, OutboxModel, Product, Session, SessionLots,
+    Subsidiary, User,
+)
+
+
+@receiver([post_save, post_delete], sender=MembershipDiscount)
+def invalidate_discount_table(sender, **kwargs):
+    bump_version(pricing.VERSION_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_scope(sender, instance, **kwargs):
+    bump_version(authorization.user_namespace(instance.pk))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_scope_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        bump_version(authorization.user_namespace(instance.pk))
+    elif pk_set:
+        for user_id in pk_set:
+            bump_version(authorization.user_namespace(user_id))
+    else:
+        # `group.user_groups.clear()` no informa qué usuarios se quitaron.
+        bump_version(authorization.GLOBAL_NAMESPACE)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version(authorization.GLOBAL_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=Group)
+@receiver([post_save, post_delete], sender=Permission)
+@receiver([post_save, post_delete], sender=Subsidiary)
+def invalidate_all_scopes(sender, **kwargs):
+    bump_version(authorization.GLOBAL_NAMESPACE)
+
+
+def _invalidate_session_days(session):
+    if session is None or session.start_time is None:
+        return
+    end_time = session.end_time or timezone.now()
+    analytics.invalidate_days(timezone.localdate(session.start_time), timezone.localdate(max(end_time, session.start_time)))
+
+
+@receiver([post_save, post_delete], sender=Session)
+def invalidate_session_utilization(sender, instance, **kwargs):
+    _invalidate_session_days(instance)
+
+
+@receiver([post_save, post_delete], sender=SessionLots)
+def invalidate_session_lots_utilization(sender, instance, **kwargs):
+    if instance.session_id is not None:
+        _invalidate_session_days(Session.objects.filter(pk=instance.session_id).first())
+
+
+@receiver([post_save, post_delete], sender=ConsoleMaintenance)
+def invalidate_console_availability(sender, **kwargs):
+    bump_version(availability.VERSION_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=ConsoleMaintenance)
+def invalidate_maintenance_utilization(sender, instance, **kwargs):
+    first_day = instance.start_date or instance.maintenance_date
+    if first_day is not None:
+        analytics.invalidate_days(first_day, max(instance.end_date or timezone.localdate(), first_day))
+
+
+@receiver(post_init, sender=Lots)
+def remember_lot_product(sender, instance, **kwargs):
+    # Con `only()`/`defer()` el campo puede no estar cargado.
+    instance._loaded_product_id = instance.__dict__.get('product_id')
+
+
+@receiver([post_save, post_delete], sender=Lots)
+def invalidate_console_lot(sender, instance, **kwargs):
+    # Solo los lotes de consolas cuentan para la disponibilidad y las unidades de la utilización.
+    # También el producto anterior: un lote que deja de ser consola sale de ambos.
+    console_product_ids = analytics.console_product_ids()
+    if instance.product_id in console_product_ids or getattr(instance, '_loaded_product_id', None) in console_product_ids:
+        bump_version(availability.VERSION_NAMESPACE)
+        bump_version(analytics.VERSION_NAMESPACE)
+    instance._loaded_product_id = instance.product_id
+
+
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_console_product(sender, instance, **kwargs):
+    # Un producto pasa a ser (o deja de ser) consola por su tipo de consola o su categoría.
+    if instance.console_type_id is not None or instance.pk in analytics.console_product_ids():
+        bump_version(availability.VERSION_NAMESPACE)
+        bump_version(analytics.VERSION_NAMESPACE)
+
+
+@receiver(post_init, sender=Category)
+def remember_category_group(sender, instance, **kwargs):
+    instance._loaded_group = instance.__dict__.get('group')
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_console_category(sender, instance, **kwargs):
+    # Solo la categoría "dispositivos" aporta consolas; también si la categoría deja de serlo.
+    if "dispositivos" in (instance.group, getattr(instance, '_loaded_group', None)):
+        bump_version(availability.VERSION_NAMESPACE)
+        bump_version(analytics.VERSION_NAMESPACE)
+    instance._loaded_group = instance.group
+
+
+def _audited(signal):
+    def decorator(func):
+        for model in audit.AUDITED_MODELS:
+            func = receiver(signal, sender=model)(func)
+        return func
+    return decorator
+
+
+@_audited(post_init)
+def audit_snapshot(sender, instance, **kwargs):
+    audit.snapshot(instance)
+
+
+@_audited(pre_save)
+def audit_capture(sender, instance, update_fields=None, **kwargs):
+    audit.capture(instance, update_fields)
+
+
+@_audited(post_save)
+def audit_save(sender, instance, created, **kwargs):
+    audit.record_save(instance, created)
+
+
+@_audited(post_delete)
+def audit_delete(sender, instance, **kwargs):
+    audit.record_delete(instance)
+
+
+def _outboxed(signal):
+    def decorator(func):
+        for model in apps.get_app_config('gamecenter').get_models():
+            if issubclass(model, OutboxModel):
+                func = receiver(signal, sender=model)(func)
+        return func
+    return decorator
+
+
+@_outboxed(post_save)
+def outbox_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        OutboxEvent.record(instance, "created" if created else "updated")
+
+
+@_outboxed(post_delete)
+def outbox_delete(sender, instance, **kwargs):
+    # El Collector envía `post_delete` dentro de su transacción, también en cascada.
+    OutboxEvent.record(instance, "deleted")
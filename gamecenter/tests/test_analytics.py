@@ -0,0 +1,136 @@
+import datetime
+
+import numpy as np
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from gamecenter.actions import analytics, availability
+from gamecenter.actions.cache_version import get_version
+from gamecenter.models import ConsoleMaintenance, ConsoleType, Lots, Person, Session, SessionLots
+from gamecenter.tests.utils import LOCAL_CACHES, make_category, make_lot, make_product
+
+DAY = datetime.date(2026, 3, 1)
+HOUR = analytics.HOUR
+
+
+def at(day, hour, minute=0):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(hour, minute)))
+
+
+def brute_force_occupancy(groups_count, hours, starts, ends, groups, origin):
+    occupied = np.zeros((groups_count, hours))
+    for start, end, group in zip(starts, ends, groups):
+        for hour in range(hours):
+            hour_start = origin + hour * HOUR
+            overlap = min(end, hour_start + HOUR) - max(start, hour_start)
+            if overlap > 0:
+                occupied[group, hour] += overlap
+    return occupied
+
+
+class AccumulateOccupancyTests(SimpleTestCase):
+    def accumulate(self, groups_count, hours, starts, ends, groups, origin):
+        occupied = np.zeros((groups_count, hours))
+        full_hours = np.zeros((groups_count, hours + 1))
+        analytics.accumulate_occupancy(occupied, full_hours, starts, ends, groups, origin)
+        return occupied + np.cumsum(full_hours, axis=1)[:, :hours] * HOUR
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        origin, hours, groups_count = 1_700_000_000.0, 48, 4
+        # Intervalos que empiezan antes, terminan después, caben en una hora o están fuera del rango.
+        starts = origin + rng.uniform(-10 * HOUR, (hours + 5) * HOUR, 2000)
+        ends = starts + rng.choice([0, 60, 1800, HOUR, 5 * HOUR, 30 * HOUR], 2000) + rng.uniform(0, 600, 2000)
+        groups = rng.integers(0, groups_count, 2000)
+
+        np.testing.assert_allclose(
+            self.accumulate(groups_count, hours, starts, ends, groups, origin),
+            brute_force_occupancy(groups_count, hours, starts, ends, groups, origin),
+        )
+
+    def test_interval_on_hour_boundaries(self):
+        origin = 0.0
+        occupied = self.accumulate(1, 4, np.array([HOUR]), np.array([3 * HOUR]), np.array([0]), origin)
+        np.testing.assert_allclose(occupied, [[0, HOUR, HOUR, 0]])
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class HourlyUtilizationTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        availability.reset()
+        self.console_type = ConsoleType.objects.create(name="PS5")
+        product = make_product("PS5 estándar", make_category("Consolas", "dispositivos"))
+        product.console_type = self.console_type
+        product.save()
+        self.lot = make_lot(product, 2, initial_stock=2, lot_number="A")
+        self.spare = make_lot(product, 1, initial_stock=1, lot_number="B")
+        self.client_person = Person.objects.create(first_name="Ana")
+
+    def play(self, start, end, lot=None):
+        session = Session.objects.create(client=self.client_person, start_time=start, end_time=end)
+        SessionLots.objects.create(session=session, lots=lot or self.lot)
+        return session
+
+    def by_hour(self, day=DAY):
+        return {row['hour'].hour: row for row in analytics.hourly_utilization(day, day)}
+
+    def test_occupancy_and_lot_maintenance(self):
+        self.play(at(DAY, 10, 30), at(DAY, 12))
+        ConsoleMaintenance.objects.create(
+            console=self.console_type, lots=self.spare, maintenance_reason="limpieza", start_date=DAY, end_date=DAY,
+        )
+        rows = self.by_hour()
+
+        self.assertEqual(len(rows), 24)
+        self.assertEqual(
+            (rows[10]['occupied_minutes'], rows[10]['available_minutes'], rows[10]['downtime_minutes']), (30.0, 180.0, 60.0)
+        )
+        self.assertEqual([rows[hour]['utilization'] for hour in (9, 10, 11, 12)], [0.0, 0.25, 0.5, 0.0])
+
+    def test_console_type_maintenance_leaves_no_capacity(self):
+        ConsoleMaintenance.objects.create(
+            console=self.console_type, maintenance_reason="reparación", start_date=DAY, end_date=DAY,
+        )
+        rows = self.by_hour()
+        self.assertEqual(rows[10]['downtime_minutes'], 180.0)
+        self.assertIsNone(rows[10]['utilization'])
+
+    def test_closed_day_is_cached_until_a_session_changes(self):
+        self.play(at(DAY, 10), at(DAY, 11))
+        self.assertEqual(self.by_hour()[10]['occupied_minutes'], 60.0)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.by_hour()[10]['occupied_minutes'], 60.0)
+        self.assertEqual(len(queries), 0)
+
+        self.play(at(DAY, 10), at(DAY, 10, 45), self.spare)
+        self.assertEqual(self.by_hour()[10]['occupied_minutes'], 105.0)
+
+    def test_snack_lots_do_not_invalidate(self):
+        versions = (get_version(analytics.VERSION_NAMESPACE), get_version(availability.VERSION_NAMESPACE))
+        make_lot(make_product("Papas"), 10)
+        self.assertEqual((get_version(analytics.VERSION_NAMESPACE), get_version(availability.VERSION_NAMESPACE)), versions)
+
+        make_lot(self.lot.product, 1, initial_stock=1, lot_number="C")
+        self.assertNotEqual(get_version(analytics.VERSION_NAMESPACE), versions[0])
+        self.assertNotEqual(get_version(availability.VERSION_NAMESPACE), versions[1])
+
+    def test_lot_save_does_not_query_products(self):
+        snack = make_lot(make_product("Papas"), 10)
+        analytics.console_product_ids()
+        with CaptureQueriesContext(connection) as queries:
+            snack.observations = "revisado"
+            snack.save()
+        self.assertFalse([query['sql'] for query in queries if 'gamecenter_product' in query['sql']])
+
+    def test_lot_moved_off_a_console_product_invalidates(self):
+        lot = Lots.objects.get(pk=self.spare.pk)
+        lot.product = make_product("Papas")
+        version = get_version(analytics.VERSION_NAMESPACE)
+        lot.save()
+        self.assertNotEqual(get_version(analytics.VERSION_NAMESPACE), version)
+        self.assertEqual(analytics.console_units()[(self.console_type.pk, None)], 2)
@@ -0,0 +1,97 @@
+import datetime
+from unittest import mock
+
+from django.db import OperationalError, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from gamecenter import audit
+from gamecenter.actions import expiration, inventory
+from gamecenter.models import AuditEntry, Lots
+from gamecenter.tests.utils import make_lot, make_product
+
+TODAY = datetime.date(2026, 3, 10)
+
+
+class AuditTests(TestCase):
+    def setUp(self):
+        self.lot = make_lot(make_product(), expiration_date=TODAY - datetime.timedelta(days=1))
+        AuditEntry.objects.all().delete()
+
+    def entries(self):
+        return list(AuditEntry.objects.filter(model="lots").order_by('id').values_list('action', 'changes'))
+
+    def test_save_is_audited(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            lot = Lots.objects.get(pk=self.lot.pk)
+            lot.lot_number = "L-2"
+            lot.save()
+        self.assertEqual(self.entries(), [("updated", {'lot_number': [None, "L-2"]})])
+
+    def test_record_movements_audits_stock(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.record_intake([(self.lot, 10)])
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.record_adjustment([(self.lot, -4)])
+        self.assertEqual(self.entries(), [
+            ("updated", {'current_stock': [0, 10]}),
+            ("updated", {'current_stock': [10, 6]}),
+        ])
+
+    def test_reconcile_fix_audits_stock(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.record_intake([(self.lot, 10)])
+        Lots.objects.filter(pk=self.lot.pk).update(current_stock=7)
+        AuditEntry.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.reconcile(fix=True)
+        self.assertEqual(self.entries(), [("updated", {'current_stock': [7, 10]})])
+
+    def test_expiration_audits_state_and_stock(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.record_intake([(self.lot, 5)])
+        AuditEntry.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            expiration.sweep(TODAY)
+        self.assertEqual(self.entries(), [
+            ("updated", {'state': ["available", "unavailable"]}),
+            ("updated", {'current_stock': [5, 0]}),
+        ])
+
+    def test_rolled_back_bulk_write_is_not_audited(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                inventory.record_intake([(self.lot, 10)])
+                raise RuntimeError
+        self.assertEqual(self.entries(), [])
+
+
+class AuditWriterTests(TransactionTestCase):
+    # `write` cierra la conexión tras un fallo, como en el hilo escritor: sin transacción envolvente.
+    def setUp(self):
+        self.writer = audit.AuditWriter(retries=2, retry_delay=0)
+        self.addCleanup(self.writer.close)
+        self.entries = [audit._entry(Lots, 1, "updated", {'state': ["available", "unavailable"]}, None, timezone.now())]
+
+    def test_failed_write_is_retried(self):
+        bulk_create = AuditEntry.objects.bulk_create
+        failures = [OperationalError("caída")]
+
+        def flaky(entries):
+            if failures:
+                raise failures.pop()
+            return bulk_create(entries)
+
+        with mock.patch.object(AuditEntry.objects, 'bulk_create', side_effect=flaky) as patched:
+            self.assertTrue(self.writer.write(self.entries))
+        self.assertEqual(patched.call_count, 2)
+        self.assertEqual(AuditEntry.objects.filter(model="lots", object_id="1").count(), 1)
+
+    def test_entries_are_logged_when_retries_run_out(self):
+        with mock.patch.object(AuditEntry.objects, 'bulk_create', side_effect=OperationalError("caída")) as patched, \
+                self.assertLogs('gamecenter.audit', 'ERROR') as logs:
+            self.assertFalse(self.writer.write(self.entries))
+        self.assertEqual(patched.call_count, 3)
+        self.assertIn("'unavailable'", logs.output[0])
@@ -0,0 +1,104 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from gamecenter import authorization
+from gamecenter.models import LocalSettings, Subsidiary, User
+from gamecenter.tests.utils import LOCAL_CACHES
+from gamecenter.views.SubsidiaryView import SubsidiaryViewSet
+
+PERM = 'gamecenter.delete_sale'
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class CachedPermissionTests(TransactionTestCase):
+    def setUp(self):
+        authorization._local.clear()
+        self.user = User.objects.create_user("cajero", password="x")
+        self.group = Group.objects.create(name="Supervisores")
+        self.group.permissions.add(Permission.objects.get(codename="delete_sale"))
+
+    def fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_matches_model_backend(self):
+        self.user.groups.add(self.group)
+        self.user.user_permissions.add(Permission.objects.get(codename="add_sale"))
+        user = self.fresh_user()
+        self.assertEqual(authorization.get_user_scope(user).permissions, ModelBackend().get_all_permissions(self.fresh_user()))
+
+    def test_superuser_matches_model_backend(self):
+        self.user.is_superuser = True
+        self.user.save()
+        permissions = authorization.get_user_scope(self.fresh_user()).permissions
+        self.assertEqual(permissions, ModelBackend().get_all_permissions(self.fresh_user()))
+        self.assertIn(PERM, permissions)
+
+    def test_grant_is_visible_after_commit(self):
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+        self.user.groups.add(self.group)
+        self.assertTrue(self.fresh_user().has_perm(PERM))
+
+    def test_revoke_is_visible_after_commit(self):
+        self.user.groups.add(self.group)
+        self.assertTrue(self.fresh_user().has_perm(PERM))
+        self.user.groups.remove(self.group)
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+
+    def test_group_permission_revoke_reaches_members(self):
+        self.user.groups.add(self.group)
+        self.assertTrue(self.fresh_user().has_perm(PERM))
+        self.group.permissions.clear()
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+
+    def test_rolled_back_grant_is_not_cached(self):
+        for warm in (True, False):
+            authorization._local.clear()
+            if warm:
+                self.assertFalse(self.fresh_user().has_perm(PERM))
+            user = self.fresh_user()
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    user.groups.add(self.group)
+                    self.assertTrue(user.has_perm(PERM))
+                    raise RuntimeError
+            self.assertEqual(user.groups.count(), 0)
+            self.assertFalse(user.has_perm(PERM))
+            self.assertFalse(self.fresh_user().has_perm(PERM))
+
+    def test_rolled_back_revoke_is_not_cached(self):
+        self.user.groups.add(self.group)
+        user = self.fresh_user()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                user.groups.remove(self.group)
+                self.assertFalse(user.has_perm(PERM))
+                raise RuntimeError
+        self.assertTrue(user.has_perm(PERM))
+
+    def test_subsidiary_scope(self):
+        local_settings = LocalSettings.objects.create()
+        branch = Subsidiary.objects.create(name="Norte", local_setting=local_settings)
+        main = Subsidiary.objects.create(name="Central", local_setting=local_settings, is_main=True)
+        self.user.subsidiary = branch
+        self.user.save()
+        scope = authorization.get_user_scope(self.fresh_user())
+        self.assertEqual((scope.subsidiary_id, scope.all_subsidiaries), (branch.pk, False))
+        self.user.subsidiary = main
+        self.user.save()
+        self.assertTrue(authorization.get_user_scope(self.fresh_user()).all_subsidiaries)
+
+    def test_user_without_subsidiary_is_restricted(self):
+        local_settings = LocalSettings.objects.create()
+        Subsidiary.objects.create(name="Norte", local_setting=local_settings)
+        request = APIRequestFactory().get('/subsidiary/')
+        force_authenticate(request, user=self.fresh_user())
+        response = SubsidiaryViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual(response.data, [])
+        self.assertFalse(authorization.get_user_scope(self.fresh_user()).all_subsidiaries)
+
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertTrue(authorization.get_user_scope(self.fresh_user()).all_subsidiaries)
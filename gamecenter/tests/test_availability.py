@@ -0,0 +1,78 @@
+import datetime
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from gamecenter.actions import availability
+from gamecenter.models import ConsoleMaintenance, ConsoleReservations, ConsoleType, Person, SessionLots
+from gamecenter.tests.utils import LOCAL_CACHES, make_category, make_lot, make_product
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ConsoleAvailabilityTests(TransactionTestCase):
+    def setUp(self):
+        availability.reset()
+        self.console_type = ConsoleType.objects.create(name="PS5")
+        product = make_product("PS5 estándar", make_category("Consolas", "dispositivos"))
+        product.console_type = self.console_type
+        product.save()
+        self.lot = make_lot(product, 2, lot_number="A")
+        self.other_lot = make_lot(product, 2, lot_number="B")
+
+    def maintenance(self, **extra):
+        return ConsoleMaintenance.objects.create(console=self.console_type, maintenance_reason="limpieza", **extra)
+
+    def test_checks_do_not_query(self):
+        self.maintenance()
+        availability.is_lot_available(self.lot.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(availability.is_lot_available(self.lot.pk))
+            self.assertFalse(availability.is_lot_available(self.lot))
+            with self.assertRaises(ValidationError):
+                availability.ensure_available(self.lot)
+        self.assertEqual(len(queries), 0)
+
+    def test_session_clean_rejects_lot_in_maintenance(self):
+        self.maintenance()
+        with self.assertRaises(ValidationError):
+            SessionLots(lots_id=self.lot.pk).clean()
+
+    def test_lot_level_maintenance_only_blocks_that_lot(self):
+        self.maintenance(lots=self.lot)
+        self.assertFalse(availability.is_lot_available(self.lot.pk))
+        self.assertTrue(availability.is_lot_available(self.other_lot.pk))
+        self.assertTrue(availability.is_console_type_available(self.console_type.pk))
+
+    def test_closing_maintenance_restores_availability(self):
+        maintenance = self.maintenance()
+        self.assertFalse(availability.is_lot_available(self.lot.pk))
+        maintenance.end_date = maintenance.maintenance_date
+        maintenance.save()
+        self.assertTrue(availability.is_lot_available(self.lot.pk))
+
+    def test_rolled_back_maintenance_is_not_cached(self):
+        for warm in (True, False):
+            availability.reset()
+            if warm:
+                self.assertTrue(availability.is_lot_available(self.lot.pk))
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.maintenance()
+                    availability.is_lot_available(self.lot.pk)
+                    raise RuntimeError
+            self.assertTrue(availability.is_lot_available(self.lot.pk))
+
+    def test_reservation_is_checked_on_its_booked_day(self):
+        today = timezone.localdate()
+        self.maintenance(start_date=today + datetime.timedelta(days=7))
+        reservation = ConsoleReservations(client=Person.objects.create(first_name="Ana"), lots=self.lot)
+        reservation.clean()
+
+        reservation.start_hour = timezone.make_aware(datetime.datetime.combine(today + datetime.timedelta(days=1), datetime.time(18)))
+        reservation.clean()
+        reservation.start_hour += datetime.timedelta(days=7)
+        with self.assertRaises(ValidationError):
+            reservation.clean()
@@ -0,0 +1,55 @@
+import datetime
+
+from django.test import TestCase
+
+from gamecenter.actions import expiration, inventory
+from gamecenter.models import InventoryMovement, Lots
+from gamecenter.tests.utils import make_category, make_lot, make_product
+
+TODAY = datetime.date(2026, 3, 10)
+YESTERDAY = TODAY - datetime.timedelta(days=1)
+
+
+class SweepTests(TestCase):
+    def setUp(self):
+        self.product = make_product()
+
+    def test_lot_without_ledger_is_opened_before_write_off(self):
+        lot = make_lot(self.product, 12, expiration_date=YESTERDAY)
+
+        self.assertEqual(expiration.sweep(TODAY), (1, 12))
+
+        lot.refresh_from_db()
+        self.assertEqual((lot.state, lot.current_stock), ("unavailable", 0))
+        self.assertEqual(inventory.stock_at(lot_ids=[lot.pk]).get(lot.pk, 0), 0)
+        self.assertEqual(inventory.reconcile(), {})
+
+    def test_write_off_uses_ledger_balance(self):
+        lot = make_lot(self.product, expiration_date=YESTERDAY)
+        inventory.record_intake([(lot, 10)])
+        inventory.record_adjustment([(lot, -4)])
+
+        self.assertEqual(expiration.sweep(TODAY), (1, 6))
+        self.assertEqual(inventory.reconcile(), {})
+        self.assertEqual(InventoryMovement.objects.filter(lot=lot).count(), 3)
+
+    def test_only_expired_perishables_are_retired(self):
+        make_lot(self.product, 5, expiration_date=TODAY)
+        make_lot(self.product, 5)
+        make_lot(make_product("Mando", make_category("Mandos", "accesorios")), 5, expiration_date=YESTERDAY)
+        make_lot(make_product("PS5", make_category("Consolas", "dispositivos")), 2, expiration_date=YESTERDAY)
+
+        self.assertEqual(expiration.sweep(TODAY), (0, 0))
+        self.assertFalse(Lots.objects.exclude(state="available").exists())
+
+    def test_sweep_runs_several_batches(self):
+        lots = [make_lot(self.product, stock, lot_number=str(stock), expiration_date=YESTERDAY) for stock in (1, 2, 3)]
+        fresh = make_lot(self.product, 4, lot_number="fresco", expiration_date=TODAY)
+
+        self.assertEqual(expiration.sweep(TODAY, batch_size=1, max_batches=2), (2, 3))
+        self.assertEqual(expiration.sweep(TODAY, batch_size=1), (1, 3))
+
+        states = dict(Lots.objects.values_list('id', 'state'))
+        self.assertEqual({states[lot.pk] for lot in lots}, {"unavailable"})
+        self.assertEqual(states[fresh.pk], "available")
+        self.assertEqual(inventory.reconcile(), {})
@@ -0,0 +1,86 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from rest_framework import viewsets
+from rest_framework.pagination import LimitOffsetPagination, PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from gamecenter.models import OpeningSalesBox, Person
+from gamecenter.views import OpeningSalesBoxViewSet, PersonViewSet
+
+
+class SmallPages(PageNumberPagination):
+    page_size = 2
+
+
+def standard(viewset, **attrs):
+    """El mismo viewset con el list estándar de DRF y JSONRenderer."""
+    return type(f"Standard{viewset.__name__}", (viewsets.ModelViewSet,), {
+        'queryset': attrs.pop('queryset', viewset.queryset),
+        'serializer_class': viewset.serializer_class,
+        'renderer_classes': [JSONRenderer],
+        **attrs,
+    })
+
+
+def fast(viewset, **attrs):
+    return type(f"Fast{viewset.__name__}", (viewset,), attrs) if attrs else viewset
+
+
+class FastListOutputTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        people = [
+            Person.objects.create(first_name="Ana", last_name="Ríos", email="ana@example.com", dni="12345678", phone="+51 999"),
+            Person.objects.create(first_name=None, last_name="Ñandú 🎮 \u2028 \"comillas\"", email=None, dni=None, phone=None),
+            Person.objects.create(first_name="José\\Luis", last_name="</script>", email="jose@example.com", dni="0", phone=""),
+        ]
+        # Microsegundos y fechas fijas para cubrir el formato ISO de ambos caminos.
+        Person.objects.filter(pk=people[0].pk).update(created_at=datetime(2024, 3, 1, 8, 30, 0, 123456, tzinfo=timezone.utc))
+        Person.objects.filter(pk=people[1].pk).update(created_at=datetime(2024, 12, 31, 23, 59, 59, tzinfo=timezone.utc))
+        for index, (opening, closing) in enumerate([("0.50", "0.00"), ("1234.05", "99999999.99"), ("-10.10", "7.00")]):
+            box = OpeningSalesBox.objects.create(
+                user=people[index], opening_amount=Decimal(opening), closing_amount=Decimal(closing),
+                closing_date=date(2024, 5, index + 1) if index else None,
+            )
+            OpeningSalesBox.objects.filter(pk=box.pk).update(opening_date=date(2024, 4, index + 1), date=date(2024, 4, index + 1))
+
+    def render(self, viewset, query=''):
+        request = APIRequestFactory().get(f'/{query}', HTTP_ACCEPT='application/json')
+        response = viewset.as_view({'get': 'list'})(request)
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def assertSameBytes(self, viewset, query='', **attrs):
+        expected = self.render(standard(viewset, **attrs), query)
+        self.assertEqual(self.render(fast(viewset, **attrs), query), expected)
+        return expected
+
+    def test_fast_path_applies(self):
+        for viewset in (PersonViewSet, OpeningSalesBoxViewSet):
+            view = viewset(request=None, format_kwarg=None, action='list')
+            self.assertIsNotNone(view.get_fast_list_spec())
+
+    def test_person_list(self):
+        content = self.assertSameBytes(PersonViewSet)
+        self.assertIn('Ñandú 🎮'.encode(), content)
+        self.assertIn(b'\\u2028', content)
+
+    def test_opening_sales_box_list(self):
+        content = self.assertSameBytes(OpeningSalesBoxViewSet)
+        self.assertIn(b'"99999999.99"', content)
+
+    def test_paginated(self):
+        for viewset in (PersonViewSet, OpeningSalesBoxViewSet):
+            ordered = viewset.queryset.order_by('pk')
+            for query in ('', '?page=2'):
+                self.assertSameBytes(viewset, query, queryset=ordered, pagination_class=SmallPages)
+            self.assertSameBytes(viewset, '?limit=1&offset=1', queryset=ordered, pagination_class=LimitOffsetPagination)
+
+    @override_settings(TIME_ZONE='America/Lima')
+    def test_local_time_zone(self):
+        content = self.assertSameBytes(PersonViewSet)
+        self.assertIn(b'-05:00', content)
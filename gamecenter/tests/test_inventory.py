@@ -0,0 +1,121 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from gamecenter.actions import inventory
+from gamecenter.models import InventoryMovement, Lots, StockSnapshot
+from gamecenter.tests.utils import make_lot, make_product
+
+DAY1 = datetime.date(2026, 3, 1)
+DAY2 = DAY1 + datetime.timedelta(days=1)
+DAY3 = DAY1 + datetime.timedelta(days=2)
+
+
+def on(day, movements):
+    """Fecha los movimientos a mediodía de `day` (`created_at` es auto_now_add)."""
+    moment = timezone.make_aware(datetime.datetime.combine(day, datetime.time(12)))
+    InventoryMovement.objects.filter(pk__in=[movement.pk for movement in movements]).update(created_at=moment)
+
+
+class LedgerTests(TestCase):
+    def setUp(self):
+        product = make_product()
+        self.lot = make_lot(product)
+        self.other = make_lot(product)
+
+    def current_stock(self, lot):
+        return Lots.objects.values_list('current_stock', flat=True).get(pk=lot.pk)
+
+    def test_record_movements_updates_current_stock(self):
+        inventory.record_intake([(self.lot, 10), (self.other, 4)])
+        inventory.record_adjustment([(self.lot, -3)])
+        self.assertEqual((self.current_stock(self.lot), self.current_stock(self.other)), (7, 4))
+        self.assertEqual(inventory.stock_at(), {self.lot.pk: 7, self.other.pk: 4})
+
+    def test_snapshot_plus_tail(self):
+        on(DAY1, inventory.record_intake([(self.lot, 10), (self.other, 5)]))
+        self.assertEqual(inventory.take_snapshot(DAY1), 2)
+        on(DAY2, inventory.record_adjustment([(self.lot, -4)]))
+
+        self.assertEqual(inventory.stock_at(DAY1), {self.lot.pk: 10, self.other.pk: 5})
+        self.assertEqual(inventory.stock_at(DAY2), {self.lot.pk: 6, self.other.pk: 5})
+        self.assertEqual(inventory.stock_at(lot_ids=[self.lot.pk]), {self.lot.pk: 6})
+
+    def test_snapshot_is_idempotent(self):
+        on(DAY1, inventory.record_intake([(self.lot, 10)]))
+        inventory.take_snapshot(DAY1)
+        inventory.take_snapshot(DAY1)
+        self.assertEqual(list(StockSnapshot.objects.values_list('lot_id', 'stock')), [(self.lot.pk, 10)])
+
+    def test_day_without_snapshot_replays_from_previous_one(self):
+        on(DAY1, inventory.record_intake([(self.lot, 10)]))
+        inventory.take_snapshot(DAY1)
+        on(DAY2, inventory.record_adjustment([(self.lot, -2)]))
+        on(DAY3, inventory.record_adjustment([(self.lot, -3)]))
+
+        self.assertEqual(inventory.stock_at(DAY2), {self.lot.pk: 8})
+        self.assertEqual(inventory.stock_at(DAY3), {self.lot.pk: 5})
+        self.assertEqual(inventory.stock_at(DAY1 - datetime.timedelta(days=1)), {})
+
+    def test_lot_at_zero_uses_latest_snapshot(self):
+        on(DAY1, inventory.record_intake([(self.lot, 3), (self.other, 5)]))
+        inventory.take_snapshot(DAY1)
+        on(DAY2, inventory.record_adjustment([(self.lot, -3)]))
+        inventory.take_snapshot(DAY2)
+        on(DAY3, inventory.record_intake([(self.lot, 2)]))
+
+        self.assertEqual(inventory._latest_snapshot(DAY2, lot_id__in=[self.lot.pk]), ({}, {}, DAY2))
+        self.assertEqual(inventory.stock_at(DAY2, lot_ids=[self.lot.pk]), {})
+        self.assertEqual(inventory.stock_at(DAY3, lot_ids=[self.lot.pk]), {self.lot.pk: 2})
+
+        # El libro anterior a la foto de DAY2 no se vuelve a leer.
+        with CaptureQueriesContext(connection) as queries:
+            inventory.stock_at(lot_ids=[self.lot.pk])
+        tail = [query['sql'] for query in queries if 'gamecenter_inventorymovement' in query['sql']]
+        self.assertEqual(len(tail), 1)
+        self.assertIn('"created_at" >=', tail[0])
+
+    def test_movement_with_lower_id_after_the_snapshot_is_counted(self):
+        # Dos transacciones: la de id menor se fecha el día siguiente y la de id mayor,
+        # que se confirma antes, cae en el día fotografiado.
+        late, early = inventory.record_intake([(self.lot, 4), (self.other, 10)])
+        self.assertLess(late.pk, early.pk)
+        on(DAY1, [early])
+        on(DAY2, [late])
+        inventory.take_snapshot(DAY1)
+
+        self.assertEqual(inventory.stock_at(DAY1), {self.other.pk: 10})
+        self.assertEqual(inventory.stock_at(), {self.lot.pk: 4, self.other.pk: 10})
+        inventory.take_snapshot(DAY2)
+        self.assertEqual(inventory.stock_at(DAY2), {self.lot.pk: 4, self.other.pk: 10})
+        self.assertEqual(inventory.reconcile(), {})
+
+    def test_open_day_cannot_be_snapshotted(self):
+        with self.assertRaises(ValueError):
+            inventory.take_snapshot(timezone.localdate())
+
+    def test_snapshot_waits_for_the_safety_lag(self):
+        yesterday = timezone.localdate() - datetime.timedelta(days=1)
+        with override_settings(GAMECENTER_SNAPSHOT_LAG=2 * 86400), self.assertRaises(ValueError):
+            inventory.take_snapshot(yesterday)
+        with override_settings(GAMECENTER_SNAPSHOT_LAG=0):
+            self.assertEqual(inventory.take_snapshot(yesterday), 0)
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        inventory.record_intake([(self.lot, 10), (self.other, 5)])
+        Lots.objects.filter(pk=self.lot.pk).update(current_stock=7)
+
+        self.assertEqual(inventory.reconcile(), {self.lot.pk: (7, 10)})
+        self.assertEqual(self.current_stock(self.lot), 7)
+
+        self.assertEqual(inventory.reconcile(fix=True), {self.lot.pk: (7, 10)})
+        self.assertEqual(self.current_stock(self.lot), 10)
+        self.assertEqual(inventory.reconcile(), {})
+
+    def test_reconcile_ignores_lots_without_ledger(self):
+        Lots.objects.filter(pk=self.lot.pk).update(current_stock=9)
+        self.assertEqual(inventory.reconcile(fix=True), {})
+        self.assertEqual(self.current_stock(self.lot), 9)
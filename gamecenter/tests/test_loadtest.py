@@ -0,0 +1,97 @@
+import asyncio
+import random
+from collections import Counter
+
+from django.test import SimpleTestCase, TestCase
+
+from gamecenter import loadtest
+from gamecenter.management.commands.loadtest import id_pools
+from gamecenter.models import LocalSettings, Subsidiary, User
+
+
+def read(data):
+    async def read_twice():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        # Lee la respuesta y lo que quede después, para comprobar que no consumió de más.
+        response = await loadtest.LoadTest('http://localhost/', [], {}).read_response(reader)
+        return response, await reader.read()
+
+    return asyncio.run(read_twice())
+
+
+class ReadResponseTests(SimpleTestCase):
+    def test_content_length(self):
+        data = b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhola!HTTP/1.1 204"
+        self.assertEqual(read(data), ((200, False), b"HTTP/1.1 204"))
+
+    def test_chunked(self):
+        data = b"HTTP/1.1 201 Created\r\nTransfer-Encoding: chunked\r\n\r\n4\r\nhola\r\n3;x=1\r\n!!!\r\n0\r\n\r\nsiguiente"
+        self.assertEqual(read(data), ((201, False), b"siguiente"))
+
+    def test_connection_close(self):
+        data = b"HTTP/1.1 404 Not Found\r\nConnection: close\r\nContent-Length: 2\r\n\r\n{}"
+        self.assertEqual(read(data), ((404, True), b""))
+
+    def test_body_until_close_without_length(self):
+        self.assertEqual(read(b"HTTP/1.0 200 OK\r\n\r\ntodo el cuerpo"), ((200, True), b""))
+
+    def test_closed_connection(self):
+        with self.assertRaises(ConnectionError):
+            read(b"")
+
+
+class SummaryTests(SimpleTestCase):
+    def test_percentile_nearest_rank(self):
+        ordered = list(range(1, 101))
+        self.assertEqual(
+            [loadtest.percentile(ordered, fraction) for fraction in (0, 0.5, 0.9, 0.99, 1)], [1, 50, 90, 99, 100]
+        )
+        self.assertEqual(loadtest.percentile([7], 0.99), 7)
+        self.assertIsNone(loadtest.percentile([], 0.5))
+
+    def test_summarize(self):
+        summary = loadtest.summarize([0.004, 0.001, 0.002, 0.003], Counter({200: 3, 500: 1}), errors=1, elapsed=2.0)
+        self.assertEqual((summary['requests'], summary['throughput_rps'], summary['error_rate']), (5, 2.5, 0.4))
+        self.assertEqual(summary['status_codes'], {'200': 3, '500': 1})
+        self.assertEqual(summary['latency_ms'], {'mean': 2.5, 'p50': 2.0, 'p90': 4.0, 'p95': 4.0, 'p99': 4.0, 'max': 4.0})
+
+    def test_summarize_without_requests(self):
+        summary = loadtest.summarize([], Counter(), errors=0, elapsed=1.0)
+        self.assertEqual((summary['requests'], summary['error_rate'], summary['latency_ms']['p50']), (0, 0.0, None))
+
+
+class BuildRequestTests(SimpleTestCase):
+    def test_extra_headers_and_filled_body(self):
+        scenario = loadtest.MIXES['frontdesk'][1]
+        test = loadtest.LoadTest('http://localhost:8000/api/', [scenario], {}, headers=["Authorization: Basic eDp5"])
+        head, _, body = test.build_request(scenario, random.Random(1)).partition(b"\r\n\r\n")
+        self.assertTrue(head.startswith(b"POST /api/person/ HTTP/1.1\r\n"))
+        self.assertIn(b"\r\nAuthorization: Basic eDp5\r\n", head)
+        self.assertIn(f"Content-Length: {len(body)}".encode(), head)
+        self.assertNotIn(b"{unique}", body)
+
+    def test_runnable_scenarios(self):
+        scenarios = loadtest.MIXES['backoffice']
+        pools = {'person': [1], 'user': []}
+        runnable, skipped = loadtest.runnable_scenarios(scenarios, pools, authenticated=False)
+        self.assertEqual([scenario.name for scenario in runnable], ['local_settings_list', 'customer_lookup'])
+        self.assertEqual(set(skipped), {'subsidiary_list', 'user_detail'})
+
+        runnable, skipped = loadtest.runnable_scenarios(scenarios, pools, authenticated=True)
+        self.assertEqual(skipped, {'user_detail': "sin ids visibles para user"})
+
+
+class IdPoolsTests(TestCase):
+    def test_pools_follow_the_user_scope(self):
+        local_settings = LocalSettings.objects.create()
+        main = Subsidiary.objects.create(name="Principal", local_setting=local_settings, is_main=True)
+        branch = Subsidiary.objects.create(name="Sucursal", local_setting=local_settings)
+        cashier = User.objects.create_user("cajero", password="x", subsidiary=branch)
+        manager = User.objects.create_user("gerente", password="x", subsidiary=main)
+
+        pools = id_pools(cashier)
+        self.assertEqual((pools['subsidiary'], pools['user']), ([branch.pk], [cashier.pk]))
+        self.assertCountEqual(id_pools(manager)['subsidiary'], [main.pk, branch.pk])
+        self.assertEqual((id_pools()['subsidiary'], id_pools()['user']), ([], []))
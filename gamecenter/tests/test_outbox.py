@@ -0,0 +1,135 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from gamecenter.actions import outbox
+from gamecenter.models import OpeningSalesBox, OutboxEvent, Person, Sale, SaleBoxMovement, Session
+
+
+class OutboxEventTests(TestCase):
+    def setUp(self):
+        self.client_person = Person.objects.create(first_name="Ana", email="ana@example.com")
+        self.cashier = Person.objects.create(first_name="Luis", email="luis@example.com")
+
+    def events(self):
+        return list(OutboxEvent.objects.order_by('id').values_list('event_type', flat=True))
+
+    def make_sale(self, session=None):
+        sale = Sale.objects.create(client=self.client_person, user=self.cashier, session=session, total=Decimal("20.00"))
+        box = OpeningSalesBox.objects.create(user=self.cashier, opening_amount=0, closing_amount=0)
+        SaleBoxMovement.objects.create(opening_sales_box=box, sale=sale, movement_type="entrada", amount=Decimal("20.00"))
+        return sale
+
+    def test_save_records_created_and_updated(self):
+        session = Session.objects.create(client=self.client_person)
+        session.state = "finalizado"
+        session.save()
+        self.assertEqual(self.events(), ["session.created", "session.updated"])
+        self.assertEqual(OutboxEvent.objects.last().payload['state'], "finalizado")
+
+    def test_cascaded_delete_records_every_row(self):
+        session = Session.objects.create(client=self.client_person)
+        self.make_sale(session)
+        OutboxEvent.objects.all().delete()
+
+        session.delete()
+
+        self.assertCountEqual(self.events(), ["session.deleted", "sale.deleted", "saleboxmovement.deleted"])
+
+    def test_queryset_delete_records_events(self):
+        self.make_sale()
+        OutboxEvent.objects.all().delete()
+
+        Sale.objects.all().delete()
+
+        self.assertCountEqual(self.events(), ["sale.deleted", "saleboxmovement.deleted"])
+
+    def test_rolled_back_change_leaves_no_event(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Session.objects.create(client=self.client_person)
+            raise RuntimeError
+        self.assertEqual(self.events(), [])
+
+
+class GetSinkTests(TestCase):
+    @override_settings(GAMECENTER_OUTBOX_SINK={
+        'BACKEND': 'gamecenter.actions.outbox.FileSink', 'OPTIONS': {'path': '/tmp/outbox.jsonl'},
+    })
+    def test_configured_options_only_apply_to_configured_backend(self):
+        self.assertEqual(str(outbox.get_sink().path), '/tmp/outbox.jsonl')
+        self.assertIsInstance(outbox.get_sink('gamecenter.actions.outbox.InMemorySink'), outbox.InMemorySink)
+        self.assertEqual(outbox.get_sink('gamecenter.actions.outbox.FileSink', path='/tmp/x').path, '/tmp/x')
+
+
+class FailingSink(outbox.BaseSink):
+    def deliver(self, messages):
+        raise ConnectionError("destino caído")
+
+
+class DrainTests(TestCase):
+    def setUp(self):
+        client_person = Person.objects.create(first_name="Ana")
+        for _ in range(5):
+            Session.objects.create(client=client_person)
+        self.ids = list(OutboxEvent.objects.order_by('id').values_list('id', flat=True))
+
+    def pending(self):
+        return list(OutboxEvent.objects.filter(published_at__isnull=True).order_by('id').values_list('id', flat=True))
+
+    def test_drain_delivers_every_batch_in_order(self):
+        sink = outbox.InMemorySink()
+        self.assertEqual(outbox.drain(sink, batch_size=2), (5, 0))
+        self.assertEqual([message['id'] for message in sink.messages], self.ids)
+        self.assertEqual(sink.messages[0]['event_type'], "session.created")
+        self.assertEqual(self.pending(), [])
+        self.assertEqual(set(OutboxEvent.objects.values_list('attempts', flat=True)), {1})
+        self.assertEqual(outbox.drain(sink), (0, 0))
+
+    def test_drain_batch_takes_one_batch(self):
+        sink = outbox.InMemorySink()
+        self.assertEqual(outbox.drain_batch(sink, batch_size=2), (2, 0))
+        self.assertEqual(self.pending(), self.ids[2:])
+        self.assertEqual(outbox.drain(sink, batch_size=2, max_batches=1), (2, 0))
+        self.assertEqual(self.pending(), self.ids[4:])
+
+    def test_failed_delivery_is_kept_with_the_error(self):
+        self.assertEqual(outbox.drain(FailingSink(), batch_size=2), (0, 2))
+        self.assertEqual(self.pending(), self.ids)
+        failed = OutboxEvent.objects.get(pk=self.ids[0])
+        self.assertEqual((failed.attempts, failed.last_error), (1, "ConnectionError: destino caído"))
+        self.assertEqual(OutboxEvent.objects.get(pk=self.ids[2]).attempts, 0)
+
+        # Los fallidos esperan su próximo intento; el resto sale ya.
+        self.assertEqual(outbox.drain(outbox.InMemorySink()), (3, 0))
+        self.assertEqual(self.pending(), self.ids[:2])
+
+        OutboxEvent.objects.filter(pk__in=self.ids[:2]).update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.drain(outbox.InMemorySink()), (2, 0))
+        delivered = OutboxEvent.objects.get(pk=self.ids[0])
+        self.assertEqual((delivered.attempts, delivered.last_error, delivered.next_attempt_at), (2, "", None))
+
+    def test_retry_delay_grows_exponentially(self):
+        OutboxEvent.objects.filter(pk=self.ids[0]).update(attempts=2)
+        before = timezone.now()
+        outbox.drain_batch(FailingSink(), batch_size=2)
+        delays = [
+            (event.next_attempt_at - before).total_seconds()
+            for event in OutboxEvent.objects.filter(pk__in=self.ids[:2]).order_by('id')
+        ]
+        self.assertAlmostEqual(delays[0], 4 * outbox.RETRY_BASE_DELAY, delta=1)
+        self.assertAlmostEqual(delays[1], outbox.RETRY_BASE_DELAY, delta=1)
+        self.assertEqual(outbox.retry_delay(30).total_seconds(), outbox.RETRY_MAX_DELAY)
+
+    def test_events_past_max_attempts_are_skipped(self):
+        OutboxEvent.objects.filter(pk=self.ids[0]).update(attempts=3)
+        sink = outbox.InMemorySink()
+        self.assertEqual(outbox.drain(sink, max_attempts=3), (4, 0))
+        self.assertEqual([message['id'] for message in sink.messages], self.ids[1:])
+        self.assertEqual(self.pending(), self.ids[:1])
+
+    def test_retry_parked_reactivates_exhausted_events(self):
+        OutboxEvent.objects.filter(pk__in=self.ids[:2]).update(attempts=3, next_attempt_at=timezone.now())
+        self.assertEqual(outbox.retry_parked(max_attempts=3), 2)
+        self.assertEqual(outbox.drain(outbox.InMemorySink(), max_attempts=3), (5, 0))
@@ -0,0 +1,123 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from gamecenter.actions import pricing
+from gamecenter.models import MembershipDiscount, MembershipType, Person, PersonMembership
+from gamecenter.tests.utils import LOCAL_CACHES, make_category, make_lot, make_price, make_product
+
+
+def discount(membership_type, percentage, category=None, product=None, is_active=True):
+    return MembershipDiscount.objects.create(
+        membership_type=membership_type, category=category, product=product,
+        percentage=Decimal(percentage), is_active=is_active,
+    )
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class DiscountPrecedenceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.snacks = make_category("Snacks")
+        cls.drinks = make_category("Bebidas")
+        cls.chips = make_product("Papas", cls.snacks)
+        cls.cookies = make_product("Galletas", cls.snacks)
+        cls.soda = make_product("Gaseosa", cls.drinks)
+        cls.gold = MembershipType.objects.create(name="Oro")
+        cls.silver = MembershipType.objects.create(name="Plata")
+        cls.client_person = Person.objects.create(first_name="Ana", last_name="Ríos")
+        PersonMembership.objects.create(person=cls.client_person, membership_type=cls.gold)
+
+        discount(cls.gold, "5")
+        discount(cls.gold, "10", category=cls.snacks)
+        discount(cls.gold, "20", product=cls.chips)
+        discount(cls.gold, "90", is_active=False)
+
+    def setUp(self):
+        pricing._compiled['version'] = None
+
+    def percentage(self, product, client=None):
+        return pricing.Checkout(client or self.client_person).discount_percentage(product.pk, product.category_id)
+
+    def test_product_rule_beats_category_and_general(self):
+        self.assertEqual(self.percentage(self.chips), Decimal("20"))
+
+    def test_category_rule_beats_general(self):
+        self.assertEqual(self.percentage(self.cookies), Decimal("10"))
+
+    def test_general_rule_applies_to_other_categories(self):
+        self.assertEqual(self.percentage(self.soda), Decimal("5"))
+
+    def test_inactive_rules_are_ignored(self):
+        self.assertEqual(pricing.compile_discount_table()[self.gold.pk][0], Decimal("5"))
+
+    def test_highest_value_across_memberships(self):
+        PersonMembership.objects.create(person=self.client_person, membership_type=self.silver)
+        discount(self.silver, "15")
+        self.assertEqual(self.percentage(self.chips), Decimal("20"))
+        self.assertEqual(self.percentage(self.cookies), Decimal("15"))
+        self.assertEqual(self.percentage(self.soda), Decimal("15"))
+
+    def test_client_without_membership_pays_full_price(self):
+        stranger = Person.objects.create(first_name="Luis")
+        self.assertEqual(self.percentage(self.chips, stranger), Decimal("0"))
+
+    def test_price_line_applies_discount(self):
+        lot = make_lot(self.chips, 10, price=make_price(self.chips, "8.00"))
+        line, = pricing.price_cart(self.client_person, [(lot.pk, 3)])
+        self.assertEqual((line.unit_price, line.discount, line.subtotal), (Decimal("8.00"), Decimal("4.80"), Decimal("19.20")))
+
+    def test_amount_must_be_positive(self):
+        lot = make_lot(self.chips, 10, price=make_price(self.chips, "8.00"))
+        for amount in (0, -2):
+            with self.assertRaises(ValidationError):
+                pricing.price_cart(self.client_person, [(lot.pk, amount)])
+
+    def test_missing_percentage_is_a_field_error(self):
+        with self.assertRaises(ValidationError) as error:
+            MembershipDiscount(membership_type=self.gold).full_clean()
+        self.assertIn('percentage', error.exception.message_dict)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class DiscountTableCacheTests(TransactionTestCase):
+    def setUp(self):
+        pricing._compiled['version'] = None
+        self.gold = MembershipType.objects.create(name="Oro")
+        self.client_person = Person.objects.create(first_name="Ana")
+        PersonMembership.objects.create(person=self.client_person, membership_type=self.gold)
+        self.product = make_product()
+        discount(self.gold, "10")
+
+    def test_query_count_does_not_depend_on_cart_size(self):
+        priced = make_price(self.product)
+        lots = [make_lot(self.product, 5, price=priced, lot_number=str(n)) for n in range(10)]
+        lots += [make_lot(self.product, 5, lot_number=f"sin-precio-{n}") for n in range(10)]
+        pricing.get_discount_table()
+
+        for cart in (lots[:1], lots[10:11], lots):
+            with CaptureQueriesContext(connection) as queries:
+                pricing.price_cart(self.client_person, [(lot.pk, 1) for lot in cart])
+            # membresías + lotes (+ precios de respaldo si algún lote no tiene precio propio)
+            expected = 2 if all(lot.price_id for lot in cart) else 3
+            self.assertEqual(len(queries), expected, [query['sql'] for query in queries])
+
+    def test_committed_rule_is_visible(self):
+        self.assertEqual(pricing.get_discount_table()[self.gold.pk][0], Decimal("10"))
+        discount(self.gold, "25")
+        self.assertEqual(pricing.get_discount_table()[self.gold.pk][0], Decimal("25"))
+
+    def test_rolled_back_rule_is_not_cached(self):
+        pricing.get_discount_table()
+        for warm in (True, False):
+            if not warm:
+                pricing._compiled['version'] = None
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    discount(self.gold, "50")
+                    pricing.get_discount_table()
+                    raise RuntimeError
+            self.assertEqual(pricing.get_discount_table()[self.gold.pk][0], Decimal("10"))
@@ -0,0 +1,30 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from gamecenter.actions import inventory, synthetic
+from gamecenter.models import (
+    ConsoleReservations, InventoryMovement, OpeningSalesBox, Person, Sale, SaleBoxMovement, SaleDetail, Session,
+    SessionLots,
+)
+
+
+class GenerateDatasetTests(TestCase):
+    def test_scale_one_is_consistent(self):
+        call_command('generate_dataset', scale=1, workers=1, stdout=StringIO())
+
+        per_scale = synthetic.PER_SCALE
+        self.assertEqual(Person.objects.count(), per_scale['persons'])
+        self.assertEqual(OpeningSalesBox.objects.count(), per_scale['opening_sales_boxes'])
+        self.assertEqual(Session.objects.count(), per_scale['sessions'])
+        self.assertEqual(SessionLots.objects.count(), per_scale['sessions'])
+        self.assertEqual(ConsoleReservations.objects.count(), per_scale['reservations'])
+        self.assertEqual(Sale.objects.count(), per_scale['sales'])
+        self.assertEqual(SaleBoxMovement.objects.count(), per_scale['sales'])
+        self.assertEqual(SaleDetail.objects.count(), per_scale['sales'] * synthetic.DETAILS_PER_SALE)
+        self.assertGreater(InventoryMovement.objects.count(), SaleDetail.objects.count())
+
+        connection.check_constraints()
+        self.assertEqual(inventory.reconcile(), {})
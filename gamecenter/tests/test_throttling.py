@@ -0,0 +1,126 @@
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from gamecenter import checks, throttling
+from gamecenter.models import User
+
+try:
+    import fakeredis
+except ImportError:  # fakeredis[lua] solo hace falta para probar el script de Redis
+    fakeredis = None
+
+LOCAL_THROTTLE = {'BACKEND': 'gamecenter.throttling.LocalTokenBucketStore', 'OPTIONS': {}}
+ENABLED = {'DEFAULT_THROTTLE_CLASSES': [checks.THROTTLE_CLASS]}
+
+
+class ThrottleStoreCheckTests(SimpleTestCase):
+    @override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_CLASSES': []}, GAMECENTER_THROTTLE=LOCAL_THROTTLE)
+    def test_disabled_throttle_is_not_checked(self):
+        self.assertEqual(checks.check_throttle_store(None), [])
+
+    @override_settings(REST_FRAMEWORK=ENABLED, GAMECENTER_THROTTLE=LOCAL_THROTTLE, DEBUG=False)
+    def test_process_local_store_is_an_error_in_production(self):
+        self.assertEqual([message.id for message in checks.check_throttle_store(None)], ['gamecenter.E002'])
+
+    @override_settings(REST_FRAMEWORK=ENABLED, GAMECENTER_THROTTLE=LOCAL_THROTTLE, DEBUG=True)
+    def test_process_local_store_is_a_warning_in_debug(self):
+        self.assertEqual([message.id for message in checks.check_throttle_store(None)], ['gamecenter.W002'])
+
+    @override_settings(REST_FRAMEWORK=ENABLED, GAMECENTER_THROTTLE={
+        'BACKEND': 'gamecenter.throttling.RedisTokenBucketStore', 'OPTIONS': {},
+    }, DEBUG=False)
+    def test_redis_store_passes(self):
+        self.assertEqual(checks.check_throttle_store(None), [])
+
+    @override_settings(REST_FRAMEWORK=ENABLED, GAMECENTER_THROTTLE={})
+    def test_missing_redis_package_is_an_error(self):
+        with mock.patch.object(throttling, 'redis', None):
+            self.assertEqual([message.id for message in checks.check_throttle_store(None)], ['gamecenter.E003'])
+
+
+class LocalTokenBucketStoreTests(SimpleTestCase):
+    def test_burst_then_reject(self):
+        store = throttling.LocalTokenBucketStore()
+        results = [store.consume("read:-:u1", rate=1, capacity=3)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        self.assertTrue(store.consume("read:-:u2", rate=1, capacity=3)[0])
+
+
+@skipIf(fakeredis is None, "requiere fakeredis[lua]")
+class RedisTokenBucketStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.client = fakeredis.FakeRedis()
+        self.store = throttling.RedisTokenBucketStore(client=self.client)
+
+    def test_burst_then_reject(self):
+        results = [self.store.consume("read:-:u1", rate=1, capacity=3) for _ in range(4)]
+        self.assertEqual([allowed for allowed, _ in results], [True, True, True, False])
+        self.assertEqual(results[0][1], 0.0)
+        self.assertGreater(results[3][1], 0.9)
+        self.assertLessEqual(results[3][1], 1.0)
+        self.assertTrue(self.store.consume("read:-:u2", rate=1, capacity=3)[0])
+
+    def test_refills_at_the_configured_rate(self):
+        key = "gamecenter:throttle:read:-:u1"
+        self.assertTrue(self.store.consume("read:-:u1", rate=10, capacity=1)[0])
+        self.assertFalse(self.store.consume("read:-:u1", rate=10, capacity=1)[0])
+        # Simula que pasaron 0.2 s: con 10 tokens/s el bucket vuelve a tener uno.
+        self.client.hset(key, 'ts', float(self.client.hget(key, 'ts')) - 0.2)
+        self.assertTrue(self.store.consume("read:-:u1", rate=10, capacity=1)[0])
+
+    def test_bucket_expires_once_it_would_be_full(self):
+        self.store.consume("write:3:u1", rate=5, capacity=20)
+        self.assertTrue(0 < self.client.pttl("gamecenter:throttle:write:3:u1") <= 5000)
+
+    def test_fails_open_when_redis_is_down(self):
+        server = fakeredis.FakeServer()
+        server.connected = False
+        store = throttling.RedisTokenBucketStore(client=fakeredis.FakeRedis(server=server))
+        self.assertEqual(store.consume("read:-:u1", rate=1, capacity=1), (True, 0.0))
+
+    def test_skips_redis_for_a_while_after_an_error(self):
+        script = mock.Mock(side_effect=[ConnectionError("caído"), [0, b"0.5"]])
+        client = mock.Mock(**{'register_script.return_value': script})
+        store = throttling.RedisTokenBucketStore(client=client, failure_cooldown=30)
+        with mock.patch.object(throttling.time, 'monotonic', return_value=1000.0):
+            with self.assertLogs('gamecenter.throttling', 'WARNING'):
+                self.assertEqual(store.consume("read:-:u1", rate=1, capacity=1), (True, 0.0))
+            self.assertEqual(store.consume("read:-:u1", rate=1, capacity=1), (True, 0.0))
+        self.assertEqual(script.call_count, 1)
+
+        with mock.patch.object(throttling.time, 'monotonic', return_value=1031.0):
+            self.assertEqual(store.consume("read:-:u1", rate=1, capacity=1), (False, 0.5))
+        self.assertEqual(script.call_count, 2)
+
+    def test_client_from_url_has_short_timeouts(self):
+        store = throttling.RedisTokenBucketStore(url='redis://192.0.2.1:6379/0', socket_connect_timeout=0.05)
+        options = store.client.connection_pool.connection_kwargs
+        self.assertEqual((options['socket_timeout'], options['socket_connect_timeout']), (0.1, 0.05))
+
+
+class ThrottleCacheKeyTests(SimpleTestCase):
+    def setUp(self):
+        self.throttle = throttling.SubsidiaryTokenBucketThrottle()
+
+    def request(self, user, method='get', **extra):
+        request = getattr(APIRequestFactory(), method)('/', **extra)
+        request.user = user
+        return request
+
+    def key(self, request, view=None):
+        view = view or object()
+        return self.throttle.get_cache_key(request, view, self.throttle.get_scope(request, view))
+
+    def test_authenticated_user_is_keyed_by_subsidiary_and_user(self):
+        self.assertEqual(self.key(self.request(User(pk=7, subsidiary_id=3))), "read:3:u7")
+        self.assertEqual(self.key(self.request(User(pk=7), 'post')), "write:-:u7")
+
+    def test_anonymous_is_keyed_by_ip(self):
+        self.assertEqual(self.key(self.request(AnonymousUser(), REMOTE_ADDR='10.0.0.5')), "read:-:10.0.0.5")
+
+    def test_view_scope_overrides_method(self):
+        view = type('View', (), {'throttle_scope': 'reports'})()
+        self.assertEqual(self.key(self.request(User(pk=7, subsidiary_id=3), 'post'), view), "reports:3:u7")
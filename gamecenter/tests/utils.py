@@ -0,0 +1,25 @@
+from decimal import Decimal
+
+from gamecenter.models import Category, Lots, Price, Product
+
+# Las pruebas corren en un solo proceso: una caché local aislada basta y no toca la compartida.
+LOCAL_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def make_category(name="Bebidas", group="comestibles"):
+    return Category.objects.create(name=name, group=group)
+
+
+def make_product(name="Gaseosa", category=None):
+    return Product.objects.create(name=name, category=category or make_category())
+
+
+def make_price(product, sale_price="10.00", unit_measurement="unidad"):
+    return Price.objects.create(
+        product=product, unit_measurement=unit_measurement,
+        sale_price=Decimal(sale_price), purchase_price=Decimal(sale_price) / 2,
+    )
+
+
+def make_lot(product, current_stock=0, price=None, **extra):
+    return Lots.objects.create(product=product, current_stock=current_stock, price=price, state="available", **extra)
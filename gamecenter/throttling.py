@@ -0,0 +1,233 @@
+"""
+Limitación de peticiones con token buckets por sede y cliente.
+
+Cada petición hace una sola operación atómica sobre el almacén: recargar el
+bucket según el tiempo transcurrido y descontar un token. La capacidad del
+bucket es la ráfaga permitida y la recarga es la tasa sostenida, definidas
+por clase de endpoint:
+
+    GAMECENTER_THROTTLE = {
+        'BACKEND': 'gamecenter.throttling.RedisTokenBucketStore',
+        'OPTIONS': {'url': 'redis://localhost:6379/0'},
+        'RATES': {
+            'read': {'burst': 60, 'rate': '20/s'},
+            'write': {'burst': 20, 'rate': '5/s'},
+        },
+    }
+
+La clase de endpoint es el `throttle_scope` de la vista o, si no lo define,
+`read`/`write` según el método. Una clase sin entrada en `RATES` no se limita.
+El throttle solo actúa si está en `DEFAULT_THROTTLE_CLASSES` (o en la vista).
+`LocalTokenBucketStore` guarda los buckets en memoria del proceso (sirve de
+doble de Redis en pruebas y desarrollo): con N workers el límite real sería N
+veces el configurado, por eso el check `gamecenter.E002` lo rechaza fuera de
+DEBUG.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+try:
+    import redis
+except ImportError:  # redis es opcional: solo lo necesita RedisTokenBucketStore
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'gamecenter.throttling.RedisTokenBucketStore'
+
+DEFAULT_RATES = {
+    'read': {'burst': 60, 'rate': '20/s'},
+    'write': {'burst': 20, 'rate': '5/s'},
+}
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'20/s', '300/min', '1000/hour'... -> tokens por segundo."""
+    num, period = rate.split('/')
+    return int(num) / PERIODS[period[0]]
+
+
+class BaseTokenBucketStore:
+    """`consume` descuenta un token del bucket y devuelve (permitido, segundos de espera)."""
+
+    def consume(self, key, rate, capacity):
+        raise NotImplementedError('`consume()` must be implemented.')
+
+
+class LocalTokenBucketStore(BaseTokenBucketStore):
+    """Buckets en un dict del proceso, protegidos por un lock."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key, rate, capacity):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = [capacity, now, capacity / rate]
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True, 0.0
+            bucket[0] = tokens
+            return False, (1 - tokens) / rate
+
+    def _prune(self, now):
+        # Un bucket que lleva más de `capacity / rate` sin uso está lleno: olvidarlo no cambia nada.
+        full = [key for key, (_, last, refill) in self._buckets.items() if now - last >= refill]
+        for key in full:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# Usa el reloj de Redis para que todos los servidores vean el mismo tiempo.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+local allowed, wait = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(wait)}
+"""
+
+
+class RedisTokenBucketStore(BaseTokenBucketStore):
+    """
+    Buckets en Redis (o cualquier servidor compatible) con un script Lua:
+    una llamada EVALSHA por petición. Si Redis no responde se deja pasar la
+    petición en lugar de tumbar la API; los timeouts cortos evitan que un
+    servidor caído retenga cada petición, y tras un error no se vuelve a
+    intentar durante `failure_cooldown` segundos (todas pasan sin límite).
+    """
+
+    def __init__(self, url='redis://localhost:6379/0', prefix='gamecenter:throttle:', client=None,
+                 socket_timeout=0.1, socket_connect_timeout=0.1, failure_cooldown=5.0):
+        if client is None:
+            if redis is None:
+                raise ImproperlyConfigured("RedisTokenBucketStore necesita el paquete `redis`.")
+            client = redis.Redis.from_url(
+                url, socket_timeout=socket_timeout, socket_connect_timeout=socket_connect_timeout,
+            )
+        self.client = client
+        self.prefix = prefix
+        self.script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.failure_cooldown = failure_cooldown
+        self._skip_until = 0.0
+
+    def consume(self, key, rate, capacity):
+        if self._skip_until and time.monotonic() < self._skip_until:
+            return True, 0.0
+        try:
+            allowed, wait = self.script(keys=[self.prefix + key], args=[rate, capacity])
+        except Exception:
+            if not self._skip_until:
+                logger.warning(
+                    "Redis no responde; el throttle deja pasar las peticiones durante %.0f s", self.failure_cooldown,
+                    exc_info=True,
+                )
+            self._skip_until = time.monotonic() + self.failure_cooldown
+            return True, 0.0
+        self._skip_until = 0.0
+        return bool(allowed), float(wait)
+
+
+_store = {'instance': None, 'rates': None}
+
+
+def get_config():
+    return getattr(settings, 'GAMECENTER_THROTTLE', {})
+
+
+def get_backend():
+    return get_config().get('BACKEND', DEFAULT_BACKEND)
+
+
+def get_store():
+    if _store['instance'] is None:
+        config = get_config()
+        backend = get_backend()
+        _store['instance'] = import_string(backend)(**config.get('OPTIONS', {}))
+    return _store['instance']
+
+
+def get_rates():
+    """{clase de endpoint: (tokens por segundo, ráfaga)}"""
+    if _store['rates'] is None:
+        _store['rates'] = {
+            scope: (parse_rate(conf['rate']), conf['burst'])
+            for scope, conf in get_config().get('RATES', DEFAULT_RATES).items()
+        }
+    return _store['rates']
+
+
+def reset():
+    _store['instance'] = _store['rates'] = None
+
+
+def _reset_on_change(setting, **kwargs):
+    if setting == 'GAMECENTER_THROTTLE':
+        reset()
+
+
+setting_changed.connect(_reset_on_change)
+
+
+class SubsidiaryTokenBucketThrottle(BaseThrottle):
+    """
+    Throttle de DRF sobre `get_store()`. El bucket es por clase de endpoint,
+    sede del usuario y cliente (usuario autenticado o IP si es anónimo), así
+    que un kiosko desbocado solo agota su propio bucket.
+    """
+
+    def get_scope(self, request, view):
+        return getattr(view, 'throttle_scope', None) or ('read' if request.method in SAFE_METHODS else 'write')
+
+    def get_cache_key(self, request, view, scope):
+        user = request.user
+        if user is not None and user.is_authenticated:
+            return f"{scope}:{user.subsidiary_id or '-'}:u{user.pk}"
+        return f"{scope}:-:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = get_rates().get(scope)
+        if rate is None:
+            return True
+        allowed, self._wait = get_store().consume(self.get_cache_key(request, view, scope), *rate)
+        return allowed
+
+    def wait(self):
+        return getattr(self, '_wait', None)
@@ -0,0 +1,7 @@
+from rest_framework import viewsets
+from gamecenter.models import ConsoleType
+from gamecenter.serializers import ConsoleTypeSerializer
+
+class ConsoleTypeViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = ConsoleType.objects.all()
+    serializer_class = ConsoleTypeSerializer
@@ -0,0 +1,128 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from gamecenter.renderers import FastJSONRenderer
+
+# Campo del serializer -> columnas cuyo valor crudo ya es su representación.
+PASSTHROUGH_FIELDS = (
+    (serializers.IntegerField, (models.IntegerField, models.AutoField)),
+    (serializers.BooleanField, (models.BooleanField,)),
+    (serializers.CharField, (models.CharField, models.TextField)),
+)
+
+
+class FastListMixin:
+    """
+    Ruta rápida de solo lectura para la acción `list`.
+
+    Lee con `.values_list()` únicamente las columnas declaradas en el
+    serializer y arma los diccionarios directamente, sin instanciar un
+    serializer por fila. Si el serializer tiene campos que no se pueden
+    resolver así (anidados, `source` con puntos, métodos, `to_representation`
+    propio...) se usa el `list` normal de DRF.
+    """
+    renderer_classes = [FastJSONRenderer] + [
+        renderer for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+        if renderer is not JSONRenderer
+    ]
+
+    def list(self, request, *args, **kwargs):
+        spec = self.get_fast_list_spec()
+        if spec is None:
+            return super().list(request, *args, **kwargs)
+
+        keys, columns, converters = spec
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*columns)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(build_rows(page, keys, converters))
+
+        return Response(build_rows(queryset, keys, converters))
+
+    def get_fast_list_spec(self):
+        """Devuelve (claves, columnas, conversores) o None si no aplica."""
+        serializer = self.get_serializer()
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return None
+        if type(serializer).to_representation is not serializers.ModelSerializer.to_representation:
+            return None
+
+        model = serializer.Meta.model
+        utc_output = settings.USE_TZ and timezone.get_current_timezone_name() == 'UTC'
+        keys, columns, converters = [], [], []
+
+        for field in serializer._readable_fields:
+            source = field.source
+            if source == '*' or '.' in source:
+                return None
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+
+            converter = get_converter(field, model_field, utc_output)
+            if converter is False:
+                return None
+            if converter is not None:
+                converters.append((len(keys), converter))
+            keys.append(field.field_name)
+            columns.append(source)
+
+        return keys, columns, converters
+
+
+def get_converter(field, model_field, utc_output):
+    """
+    None si el valor crudo ya es la representación final (o un tipo que
+    FastJSONRenderer escribe igual), el `to_representation` del campo si hay
+    que convertir, o False si el campo no admite la ruta rápida.
+    """
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None or not model_field.is_relation:
+            return False
+        return None if model_field.target_field.primary_key else False
+    if isinstance(field, serializers.RelatedField):
+        return False
+    if isinstance(field, serializers.ChoiceField):
+        if all(isinstance(key, str) for key in field.choice_strings_to_values.values()):
+            return None
+        return field.to_representation
+    for field_class, model_field_classes in PASSTHROUGH_FIELDS:
+        if isinstance(field, field_class):
+            return None if isinstance(model_field, model_field_classes) else field.to_representation
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if utc_output and isinstance(output_format, str) and output_format.lower() == ISO_8601:
+            return None
+        return field.to_representation
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if isinstance(output_format, str) and output_format.lower() == ISO_8601:
+            return None
+        return field.to_representation
+    if isinstance(field, serializers.DecimalField):
+        return field.to_representation
+    return False
+
+
+def build_rows(rows, keys, converters):
+    if not converters:
+        return [dict(zip(keys, row)) for row in rows]
+
+    result = []
+    for row in rows:
+        row = list(row)
+        for index, converter in converters:
+            value = row[index]
+            if value is not None:
+                row[index] = converter(value)
+        result.append(dict(zip(keys, row)))
+    return result
@@ -1,7 +1,8 @@
 from rest_framework import viewsets
 from gamecenter.models import OpeningSalesBox
 from gamecenter.serializers import OpeningSalesBoxSerializer
+from gamecenter.views.FastListMixin import FastListMixin
 
-class OpeningSalesBoxViewSet(viewsets.ModelViewSet):
+class OpeningSalesBoxViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = OpeningSalesBox.objects.all()
     serializer_class = OpeningSalesBoxSerializer
@@ -1,7 +1,8 @@
 from rest_framework import viewsets
 from gamecenter.models import Person
 from gamecenter.serializers import PersonSerializer
+from gamecenter.views.FastListMixin import FastListMixin
 
-class PersonViewSet(viewsets.ModelViewSet):
+class PersonViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Person.objects.all()
     serializer_class = PersonSerializer
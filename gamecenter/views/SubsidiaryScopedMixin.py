@@ -0,0 +1,25 @@
+from gamecenter.authorization import get_user_scope
+
+
+def scope_queryset(queryset, user, subsidiary_field='subsidiary'):
+    """Filtra `queryset` a lo que `user` puede ver según su sede."""
+    scope = get_user_scope(user)
+    if scope.all_subsidiaries:
+        return queryset
+    if scope.subsidiary_id is None:
+        return queryset.none()
+    return queryset.filter(**{subsidiary_field: scope.subsidiary_id})
+
+
+class SubsidiaryScopedMixin:
+    """
+    Limita el queryset a la sede del usuario autenticado.
+
+    El alcance sale de la caché de `gamecenter.authorization`, así que filtrar
+    no agrega consultas. Solo los superusuarios y los usuarios de la sede
+    principal ven todas las sedes; anónimos y usuarios sin sede no ven ninguna.
+    """
+    subsidiary_field = 'subsidiary'
+
+    def get_queryset(self):
+        return scope_queryset(super().get_queryset(), self.request.user, self.subsidiary_field)
@@ -1,7 +1,9 @@
 from rest_framework import viewsets
 from gamecenter.models import Subsidiary
 from gamecenter.serializers import SubsidiarySerializer
+from gamecenter.views.SubsidiaryScopedMixin import SubsidiaryScopedMixin
 
-class SubsidiaryViewSet(viewsets.ModelViewSet):
+class SubsidiaryViewSet(SubsidiaryScopedMixin, viewsets.ModelViewSet):
     queryset = Subsidiary.objects.all()
     serializer_class = SubsidiarySerializer
+    subsidiary_field = 'pk'
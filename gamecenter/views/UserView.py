@@ -1,8 +1,9 @@
 from rest_framework import viewsets
 from gamecenter.models import User
 from gamecenter.serializers import UserSerializer
+from gamecenter.views.SubsidiaryScopedMixin import SubsidiaryScopedMixin
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SubsidiaryScopedMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
 
@@ -4,3 +4,4 @@ from .PersonView import PersonViewSet
 from .UserView import UserViewSet
 from .SubsidiaryView import SubsidiaryViewSet
 from .LocalSettingsView import LocalSettingsViewSet
+from .ConsoleTypeView import ConsoleTypeViewSet
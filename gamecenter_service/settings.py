@@ -59,6 +59,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'gamecenter.audit.AuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -98,6 +99,66 @@ DATABASES = {
 }
 
 
+AUTH_USER_MODEL = 'gamecenter.User'
+
+AUTHENTICATION_BACKENDS = [
+    'gamecenter.authorization.CachedModelBackend',
+]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# La caché debe ser compartida entre procesos: las versiones de invalidación
+# (permisos, descuentos, mantenimientos, utilización) y la precarga nocturna de
+# `console_utilization` solo sirven si todos los workers ven las mismas claves.
+# Con varios servidores usar Redis, p. ej. CACHE_URL=redis://localhost:6379/1
+CACHES = {
+    'default': env.cache('CACHE_URL', default='filecache:///var/tmp/gamecenter_cache?max_entries=10000'),
+}
+
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/throttling/
+
+# La limitación de peticiones viene apagada: sin THROTTLE_ENABLED=true la API
+# no limita nada. Los buckets viven en Redis para que el límite sea el mismo con
+# cualquier número de workers. Para activarla en un despliegue (ver README.md):
+#   1. Redis accesible desde todos los servidores y THROTTLE_REDIS_URL apuntando a él.
+#   2. THROTTLE_ENABLED=true en el entorno de cada servidor.
+#   3. `manage.py check` sin errores gamecenter.E002/E003 y
+#      `manage.py bench_throttle --url $THROTTLE_REDIS_URL` para confirmar que Redis ejecuta el script.
+# Los anónimos se identifican por IP: los kioskos detrás de un mismo NAT deben
+# autenticarse para tener cada uno su bucket.
+THROTTLE_ENABLED = env.bool('THROTTLE_ENABLED', default=False)
+
+REST_FRAMEWORK = {
+    'DEFAULT_THROTTLE_CLASSES': [
+        'gamecenter.throttling.SubsidiaryTokenBucketThrottle',
+    ] if THROTTLE_ENABLED else [],
+}
+
+# Ráfaga (capacidad del bucket) y tasa sostenida por clase de endpoint.
+GAMECENTER_THROTTLE = {
+    'BACKEND': 'gamecenter.throttling.RedisTokenBucketStore',
+    'OPTIONS': {'url': env('THROTTLE_REDIS_URL', default='redis://localhost:6379/0')},
+    'RATES': {
+        'read': {'burst': 60, 'rate': '20/s'},
+        'write': {'burst': 20, 'rate': '5/s'},
+    },
+}
+
+# Foto diaria de stock: segundos tras la medianoche antes de poder tomarla. Debe
+# superar la transacción más larga que registra movimientos de inventario.
+GAMECENTER_SNAPSHOT_LAG = 900
+
+# Historial de cambios: 'commit' escribe al cerrar la petición; 'thread' usa un hilo escritor.
+GAMECENTER_AUDIT = {
+    'MODE': 'commit',
+    'OPTIONS': {'queue_size': 10000, 'batch_size': 500},
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 